@@ -2,10 +2,10 @@
 Pydantic DTOs for transport/validation between layers.
 """
 
-from datetime import date
-from typing import List, Optional
+from datetime import date, datetime
+from typing import Any, List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator, model_validator
 
 
 class GeneratedQuestionDTO(BaseModel):
@@ -22,29 +22,71 @@ class QuestionAnswerDTO(BaseModel):
     answer: str
 
 
-class GeneratedTaskDTO(BaseModel):
-    title: str
-    description: str
-    estimated_duration: str
-    priority: str = Field(pattern="^(high|medium|low)$")
+_TASK_PRIORITIES = frozenset({"high", "medium", "low"})
+_TASK_CATEGORIES = frozenset({"preparation", "learning", "practice", "review", "achievement"})
+
+
+def _choice(value: Any, choices: frozenset, default: str) -> str:
+    """Case-insensitive match against choices; anything else becomes default."""
+    value = str(value).strip().lower() if value is not None else ""
+    return value if value in choices else default
+
+
+class LLMOutputDTO(BaseModel):
+    """Base for DTOs parsed from LLM output: null fields fall back to their defaults."""
+
+    @model_validator(mode="before")
+    @classmethod
+    def _drop_nulls(cls, data: Any) -> Any:
+        if isinstance(data, dict):
+            return {key: value for key, value in data.items() if value is not None}
+        return data
+
+
+class GeneratedTaskDTO(LLMOutputDTO):
+    title: str = ""
+    description: str = ""
+    estimated_duration: str = "1 hour"
+    priority: str = "medium"
     is_recurring: bool = False
     recurrence_period: Optional[str] = None
-    category: str = Field(
-        default="learning", pattern="^(preparation|learning|practice|review|achievement)$"
-    )
+    category: str = "learning"
 
+    @field_validator("priority", mode="before")
+    @classmethod
+    def _lenient_priority(cls, value: Any) -> str:
+        return _choice(value, _TASK_PRIORITIES, "medium")
 
-class GeneratedMilestoneDTO(BaseModel):
-    title: str
-    description: str
-    target_date: date
-    tasks: List[GeneratedTaskDTO]
+    @field_validator("category", mode="before")
+    @classmethod
+    def _lenient_category(cls, value: Any) -> str:
+        return _choice(value, _TASK_CATEGORIES, "learning")
+
+
+class GeneratedMilestoneDTO(LLMOutputDTO):
+    title: str = ""
+    description: str = ""
+    target_date: date = Field(default_factory=date.today)
+    tasks: List[GeneratedTaskDTO] = Field(default_factory=list)
     requirements: str = ""
     success_criteria: str = ""
 
-
-class GeneratedPlanDTO(BaseModel):
-    summary: str
+    @field_validator("target_date", mode="before")
+    @classmethod
+    def _lenient_target_date(cls, value: Any) -> date:
+        """Accept dates and ISO datetimes; anything unparseable becomes today."""
+        if isinstance(value, date):
+            return value
+        if isinstance(value, str):
+            try:
+                return datetime.fromisoformat(value).date()
+            except ValueError:
+                pass
+        return date.today()
+
+
+class GeneratedPlanDTO(LLMOutputDTO):
+    summary: str = ""
     milestones: List[GeneratedMilestoneDTO]
     tips: List[str] = Field(default_factory=list)
     potential_obstacles: List[str] = Field(default_factory=list)
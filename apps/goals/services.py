@@ -5,8 +5,7 @@ Responsible for orchestrating LLM calls and mapping to/from entities/DTOs.
 """
 
 import logging
-from datetime import date, datetime
-from typing import Any, List
+from typing import Generator, List
 
 from core.llm import (
     LLMError,
@@ -15,13 +14,14 @@ from core.llm import (
 )
 from core.llm.prompts import (
     FALLBACK_QUESTIONS,
-    GENERATE_QUESTIONS_TEMPLATE,
-    GOAL_PLAN_TEMPLATE,
     GOAL_PLANNER_SYSTEM,
     QUESTION_GENERATOR_SYSTEM,
+    format_generate_questions_prompt,
+    format_goal_plan_prompt,
 )
 from django.utils import timezone
 
+from .domain.dto import GeneratedMilestoneDTO, GeneratedPlanDTO
 from .domain.entities import (
     GeneratedMilestone,
     GeneratedPlan,
@@ -49,7 +49,7 @@ def generate_questions(goal: Goal, user_id: int) -> tuple[List[GeneratedQuestion
     goal_description = f"{goal.title}. {goal.description}" if goal.description else goal.title
 
     try:
-        prompt = GENERATE_QUESTIONS_TEMPLATE.format(goal_description=goal_description)
+        prompt = format_generate_questions_prompt(goal_description)
 
         response = gemini_client.generate_json(
             prompt=prompt,
@@ -82,18 +82,22 @@ def generate_questions(goal: Goal, user_id: int) -> tuple[List[GeneratedQuestion
         return _fallback_questions(), True
 
 
+# FALLBACK_QUESTIONS is static, so it is converted to entities once at import
+_FALLBACK_QUESTIONS = tuple(
+    GeneratedQuestion(
+        id=q.get("id", f"q{idx+1}"),
+        question=q.get("question", ""),
+        type=q.get("type", "text"),
+        placeholder=q.get("placeholder", ""),
+        options=q.get("options", []) if q.get("type") == "choice" else [],
+    )
+    for idx, q in enumerate(FALLBACK_QUESTIONS)
+)
+
+
 def _fallback_questions() -> List[GeneratedQuestion]:
-    """Convert fallback dicts to entities."""
-    return [
-        GeneratedQuestion(
-            id=q.get("id", f"q{idx+1}"),
-            question=q.get("question", ""),
-            type=q.get("type", "text"),
-            placeholder=q.get("placeholder", ""),
-            options=q.get("options", []) if q.get("type") == "choice" else [],
-        )
-        for idx, q in enumerate(FALLBACK_QUESTIONS)
-    ]
+    """Fallback questions as entities (shared instances; callers only read them)."""
+    return list(_FALLBACK_QUESTIONS)
 
 
 # -----------------------------------------------------------------------------
@@ -119,88 +123,98 @@ def generate_plan(
         num_milestones: Number of milestones to generate (1-10).
         tasks_per_milestone: Number of tasks per milestone (1-6).
     """
+    response = gemini_client.generate_json(
+        prompt=_format_plan_prompt(goal, answers, num_milestones, tasks_per_milestone),
+        user_id=user_id,
+        system_prompt=GOAL_PLANNER_SYSTEM,
+        schema=GeneratedPlanDTO,
+        # Plans are personal, and resubmitting answers should yield a fresh plan
+        cache_ttl=0,
+    )
+    return _plan_from_response(response)
+
+
+def stream_plan(
+    goal: Goal,
+    answers: List[QuestionAnswer],
+    user_id: int,
+    num_milestones: int = 5,
+    tasks_per_milestone: int = 3,
+) -> Generator[GeneratedMilestone, None, GeneratedPlan]:
+    """
+    Like generate_plan(), but yields each milestone as soon as the LLM has written it.
+
+    The generator's return value (the StopIteration value) is the complete plan.
+    """
+    stream = gemini_client.generate_json_stream(
+        prompt=_format_plan_prompt(goal, answers, num_milestones, tasks_per_milestone),
+        user_id=user_id,
+        system_prompt=GOAL_PLANNER_SYSTEM,
+        array_key="milestones",
+        schema=GeneratedPlanDTO,
+        item_schema=GeneratedMilestoneDTO,
+    )
+    try:
+        while True:
+            try:
+                ms = next(stream)
+            except StopIteration as stop:
+                return _plan_from_response(stop.value)
+            yield _parse_milestone(ms)
+    finally:
+        # Ends the LLM stream early if the caller stops iterating
+        stream.close()
+
+
+def _format_plan_prompt(
+    goal: Goal,
+    answers: List[QuestionAnswer],
+    num_milestones: int,
+    tasks_per_milestone: int,
+) -> str:
+    """Build the plan-generation prompt for a goal and the user's answers."""
     # Format answers for prompt
-    answers_text = "\n".join(f"Q: {a.question}\nA: {a.answer}" for a in answers)
+    answers_text = "\n".join([f"Q: {a.question}\nA: {a.answer}" for a in answers])
 
     # Get today's date
-    from django.utils import timezone
-
     today_date = timezone.now().date().isoformat()
 
-    prompt = GOAL_PLAN_TEMPLATE.format(
+    return format_goal_plan_prompt(
         goal_title=goal.title,
-        goal_description=goal.description or "",
-        answers=answers_text,
+        goal_description=goal.description,
+        answers_text=answers_text,
         target_date=goal.target_date.isoformat(),
         today_date=today_date,
         num_milestones=num_milestones,
         tasks_per_milestone=tasks_per_milestone,
     )
 
-    response = gemini_client.generate_json(
-        prompt=prompt,
-        user_id=user_id,
-        system_prompt=GOAL_PLANNER_SYSTEM,
-    )
-
-    # Parse milestones
-    milestones = []
-    for ms in response.get("milestones", []):
-        tasks = [
-            GeneratedTask(
-                title=t.get("title", ""),
-                description=t.get("description", ""),
-                estimated_duration=t.get("estimated_duration", "1 hour"),
-                priority=t.get("priority", "medium"),
-                is_recurring=t.get("is_recurring", False),
-                recurrence_period=t.get("recurrence_period"),
-                category=t.get("category", "learning"),
-            )
-            for t in ms.get("tasks", [])
-        ]
 
-        target_date = _parse_date(ms.get("target_date"))
+def _parse_milestone(ms: GeneratedMilestoneDTO) -> GeneratedMilestone:
+    """Map one validated milestone from the LLM response to an entity."""
+    return GeneratedMilestone(
+        title=ms.title,
+        description=ms.description,
+        target_date=ms.target_date,
+        requirements=ms.requirements,
+        success_criteria=ms.success_criteria,
+        tasks=[GeneratedTask(**t.model_dump()) for t in ms.tasks],
+    )
 
-        milestones.append(
-            GeneratedMilestone(
-                title=ms.get("title", ""),
-                description=ms.get("description", ""),
-                target_date=target_date,
-                requirements=ms.get("requirements", ""),
-                success_criteria=ms.get("success_criteria", ""),
-                tasks=tasks,
-            )
-        )
 
+def _plan_from_response(response: GeneratedPlanDTO) -> GeneratedPlan:
+    """Map the validated LLM plan response to an entity."""
     return GeneratedPlan(
-        summary=response.get("summary", ""),
-        milestones=milestones,
-        tips=response.get("tips", []),
-        potential_obstacles=response.get("potential_obstacles", []),
-        motivation=response.get("motivation", ""),
-        final_achievement=response.get("final_achievement", ""),
-        icon=response.get("icon", ""),
+        summary=response.summary,
+        milestones=[_parse_milestone(ms) for ms in response.milestones],
+        tips=response.tips,
+        potential_obstacles=response.potential_obstacles,
+        motivation=response.motivation,
+        final_achievement=response.final_achievement,
+        icon=response.icon,
     )
 
 
-def _parse_date(value: Any) -> date:
-    """Parse a date from various formats."""
-    if value is None:
-        return date.today()
-    if isinstance(value, date):
-        return value
-    if isinstance(value, str):
-        try:
-            return datetime.strptime(value, "%Y-%m-%d").date()
-        except ValueError:
-            pass
-        try:
-            return datetime.fromisoformat(value).date()
-        except ValueError:
-            pass
-    return date.today()
-
-
 # -----------------------------------------------------------------------------
 # Persistence helpers
 # -----------------------------------------------------------------------------
@@ -221,33 +235,35 @@ def save_questions(goal: Goal, questions: List[GeneratedQuestion]) -> None:
     goal.save(update_fields=["planning_questions", "updated_at"])
 
 
+def milestone_to_dict(milestone: GeneratedMilestone) -> dict:
+    """Serialize a generated milestone the way it is stored in llm_generated_plan."""
+    return {
+        "title": milestone.title,
+        "description": milestone.description,
+        "target_date": milestone.target_date.isoformat(),
+        "requirements": milestone.requirements,
+        "success_criteria": milestone.success_criteria,
+        "tasks": [
+            {
+                "title": t.title,
+                "description": t.description,
+                "estimated_duration": t.estimated_duration,
+                "priority": t.priority,
+                "is_recurring": t.is_recurring,
+                "recurrence_period": t.recurrence_period,
+                "category": t.category,
+            }
+            for t in milestone.tasks
+        ],
+    }
+
+
 def save_plan(goal: Goal, plan: GeneratedPlan) -> None:
     """Persist generated plan onto the Goal."""
     goal.llm_generated_plan = {
         "icon": plan.icon,
         "summary": plan.summary,
-        "milestones": [
-            {
-                "title": m.title,
-                "description": m.description,
-                "target_date": m.target_date.isoformat(),
-                "requirements": m.requirements,
-                "success_criteria": m.success_criteria,
-                "tasks": [
-                    {
-                        "title": t.title,
-                        "description": t.description,
-                        "estimated_duration": t.estimated_duration,
-                        "priority": t.priority,
-                        "is_recurring": t.is_recurring,
-                        "recurrence_period": t.recurrence_period,
-                        "category": t.category,
-                    }
-                    for t in m.tasks
-                ],
-            }
-            for m in plan.milestones
-        ],
+        "milestones": [milestone_to_dict(m) for m in plan.milestones],
         "tips": plan.tips,
         "potential_obstacles": plan.potential_obstacles,
         "motivation": plan.motivation,
@@ -0,0 +1,125 @@
+"""
+Tests for Goal API endpoints.
+"""
+
+import datetime
+
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.goals import services
+from apps.goals.domain.dto import GeneratedMilestoneDTO, GeneratedPlanDTO
+from apps.goals.models import Goal
+from apps.users.models import User
+from core.llm.exceptions import RateLimitExceeded
+
+ANSWERS = {"answers": [{"question_id": "q1", "question": "Why?", "answer": "Because."}]}
+
+MILESTONES = [GeneratedMilestoneDTO(title="First"), GeneratedMilestoneDTO(title="Second")]
+
+
+@pytest.fixture
+def user():
+    """Create and return the user that owns the test goals."""
+    return User.objects.create_user(email="goals@example.com", password="testpass123")
+
+
+@pytest.fixture
+def api_client(user):
+    """Return an API client authenticated as ``user``."""
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+
+@pytest.fixture
+def goal(user):
+    """Create and return a draft goal."""
+    return Goal.objects.create(
+        user=user,
+        title="Run a marathon",
+        target_date=datetime.date.today() + datetime.timedelta(days=180),
+    )
+
+
+@pytest.fixture
+def llm_stream(monkeypatch):
+    """
+    Replace the LLM stream with one yielding MILESTONES.
+
+    Returns a dict recording whether the stream was closed; set its "error"
+    to have the stream raise after the first milestone.
+    """
+    state = {"closed": False, "error": None}
+
+    def generate_json_stream(*args, **kwargs):
+        try:
+            for ms in MILESTONES:
+                yield ms
+                if state["error"]:
+                    raise state["error"]
+            return GeneratedPlanDTO(summary="Plan", milestones=MILESTONES)
+        finally:
+            state["closed"] = True
+
+    monkeypatch.setattr(services.gemini_client, "generate_json_stream", generate_json_stream)
+    return state
+
+
+def _events(response):
+    """Return the SSE event names in a streamed response."""
+    return [
+        line.split(":", 1)[1].strip()
+        for chunk in response.streaming_content
+        for line in chunk.decode().splitlines()
+        if line.startswith("event:")
+    ]
+
+
+@pytest.mark.django_db
+class TestSubmitAnswersStream:
+    """Tests for the submit_answers_stream action."""
+
+    def _post(self, api_client, goal):
+        url = reverse("goal-submit-answers-stream", args=[goal.id])
+        return api_client.post(url, ANSWERS, format="json", HTTP_ACCEPT="text/event-stream")
+
+    def test_streams_milestones_and_saves_plan(self, api_client, goal, llm_stream):
+        """Test that each milestone is an event and the plan is saved at the end."""
+        response = self._post(api_client, goal)
+        assert _events(response) == ["milestone", "milestone", "plan"]
+
+        goal.refresh_from_db()
+        assert goal.status == Goal.Status.DRAFT
+        assert goal.llm_generated_plan["summary"] == "Plan"
+        assert llm_stream["closed"]
+
+    def test_error_resets_goal(self, api_client, goal, llm_stream):
+        """Test that an LLM error mid-stream ends with an error event and a draft goal."""
+        llm_stream["error"] = RateLimitExceeded("Hourly limit reached", retry_after=60)
+        response = self._post(api_client, goal)
+        assert _events(response) == ["milestone", "error"]
+
+        goal.refresh_from_db()
+        assert goal.status == Goal.Status.DRAFT
+        assert goal.llm_generated_plan is None
+
+    def test_client_disconnect_resets_goal(self, api_client, goal, llm_stream):
+        """Test that closing the stream early resets the goal and closes the LLM stream."""
+        response = self._post(api_client, goal)
+        assert b"event: milestone" in next(response.streaming_content)
+
+        goal.refresh_from_db()
+        assert goal.status == Goal.Status.PLANNING
+
+        # What the WSGI server does when the client goes away. Close the test
+        # client's wrapper around the stream rather than the response itself: the
+        # wrapper closes the response with close_old_connections disconnected, so
+        # request_finished leaves the test's DB connection open
+        response._iterator.close()
+
+        goal.refresh_from_db()
+        assert goal.status == Goal.Status.DRAFT
+        assert goal.llm_generated_plan is None
+        assert llm_stream["closed"]
@@ -0,0 +1,78 @@
+"""
+Tests for validating LLM plan output with the goal DTOs.
+"""
+
+from datetime import date
+
+from apps.goals.domain.dto import GeneratedMilestoneDTO, GeneratedPlanDTO, GeneratedTaskDTO
+
+
+class TestGeneratedTaskDTO:
+    """Tests for GeneratedTaskDTO leniency towards LLM output."""
+
+    def test_priority_and_category_are_lowercased(self):
+        """Test that known values in another case are accepted."""
+        task = GeneratedTaskDTO(title="Run", priority="High", category=" Practice ")
+        assert task.priority == "high"
+        assert task.category == "practice"
+
+    def test_unknown_priority_and_category_use_defaults(self):
+        """Test that off-list values fall back instead of failing the plan."""
+        task = GeneratedTaskDTO(title="Run", priority="urgent", category="habit")
+        assert task.priority == "medium"
+        assert task.category == "learning"
+
+    def test_nulls_use_defaults(self):
+        """Test that null fields become their defaults."""
+        task = GeneratedTaskDTO(
+            title=None,
+            description=None,
+            priority=None,
+            is_recurring=None,
+            estimated_duration=None,
+        )
+        assert task.title == ""
+        assert task.description == ""
+        assert task.priority == "medium"
+        assert task.is_recurring is False
+        assert task.estimated_duration == "1 hour"
+
+    def test_missing_title(self):
+        """Test that a task without a title still validates."""
+        assert GeneratedTaskDTO(description="Stretch").title == ""
+
+
+class TestGeneratedMilestoneDTO:
+    """Tests for GeneratedMilestoneDTO leniency towards LLM output."""
+
+    def test_lenient_tasks_and_fields(self):
+        """Test that one odd task or null field doesn't reject the milestone."""
+        milestone = GeneratedMilestoneDTO.model_validate(
+            {
+                "description": None,
+                "target_date": "2026-11-01T00:00:00",
+                "tasks": [{"title": "A", "priority": "HIGH"}, {"category": "habit"}],
+            }
+        )
+        assert milestone.title == ""
+        assert milestone.description == ""
+        assert milestone.target_date == date(2026, 11, 1)
+        assert [t.priority for t in milestone.tasks] == ["high", "medium"]
+        assert milestone.tasks[1].category == "learning"
+
+    def test_unparseable_target_date_is_today(self):
+        """Test that an invalid date falls back to today."""
+        assert GeneratedMilestoneDTO(target_date="next week").target_date == date.today()
+
+
+class TestGeneratedPlanDTO:
+    """Tests for GeneratedPlanDTO leniency towards LLM output."""
+
+    def test_null_plan_fields(self):
+        """Test that null top-level fields become their defaults."""
+        plan = GeneratedPlanDTO.model_validate(
+            {"summary": None, "tips": None, "milestones": [{"title": "Week 1"}]}
+        )
+        assert plan.summary == ""
+        assert plan.tips == []
+        assert plan.milestones[0].title == "Week 1"
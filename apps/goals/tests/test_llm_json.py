@@ -0,0 +1,39 @@
+"""
+Tests for JSON extraction from LLM responses.
+"""
+
+from core.llm.client import GeminiClient
+
+extract_json = GeminiClient._extract_json
+
+
+class TestExtractJson:
+    """Tests for GeminiClient._extract_json."""
+
+    def test_fenced_json(self):
+        """Test extracting JSON from a ```json code block."""
+        text = 'Here you go:\n```json\n{"a": 1}\n```\nAnything else?'
+        assert extract_json(text) == '{"a": 1}'
+
+    def test_bare_json_is_returned_as_is(self):
+        """Test that a bare JSON body skips fence handling, even with backticks inside."""
+        payload = '{"snippet": "```json\\n{}\\n```"}'
+        assert extract_json(f"  {payload}\n") == payload
+
+    def test_raw_json_with_surrounding_text(self):
+        """Test extracting a bare object, ignoring brackets inside strings."""
+        assert extract_json('Result: {"a": {"b": "}"}} done') == '{"a": {"b": "}"}}'
+
+    def test_nested_codeblocks(self):
+        """Test that an inner fenced block does not close the outer one."""
+        text = "```markdown\nOuter start\n```python\nprint(1)\n```\nOuter end\n```\ntrailing"
+        assert extract_json(text) == "Outer start\n```python\nprint(1)\n```\nOuter end"
+
+    def test_json_with_codeblock_in_a_value(self):
+        """Test that backticks inside a JSON string value are kept."""
+        payload = '{"snippet": "```python\\nprint(1)\\n```", "ok": true}'
+        assert extract_json(f"```json\n{payload}\n```") == payload
+
+    def test_truncated_fenced_json(self):
+        """Test that an unclosed block returns the rest for repair."""
+        assert extract_json('```json\n{"a": [1, 2') == '{"a": [1, 2'
@@ -0,0 +1,81 @@
+"""
+Tests for streaming JSON items out of LLM responses.
+"""
+
+import pytest
+
+from core.llm.client import GeminiClient, _ArrayItemScanner
+from core.llm.exceptions import LLMResponseError
+
+
+def _stream(client, chunks, **kwargs):
+    """Run generate_json_stream() over canned chunks; return (items, final value)."""
+    client.generate_stream = lambda *args, **kw: iter(chunks)
+    stream = client.generate_json_stream("prompt", **kwargs)
+    items = []
+    while True:
+        try:
+            items.append(next(stream))
+        except StopIteration as stop:
+            return items, stop.value
+
+
+class TestArrayItemScanner:
+    """Tests for _ArrayItemScanner."""
+
+    def test_item_split_across_chunks(self):
+        """Test that an item is returned once its closing bracket arrives."""
+        scanner = _ArrayItemScanner("milestones")
+        assert scanner.feed('{"summary": "s", "milestones": [{"title": "A"}, {"ti') == [
+            {"title": "A"}
+        ]
+        assert scanner.feed('tle": "B", "tasks": [{"title": "t"}]}') == [
+            {"title": "B", "tasks": [{"title": "t"}]}
+        ]
+        assert scanner.feed("]}") == []
+
+    def test_brackets_inside_strings(self):
+        """Test that brackets and escaped quotes inside strings don't end an item."""
+        scanner = _ArrayItemScanner("milestones")
+        text = '{"milestones": [{"title": "a } ] \\" {", "x": 1}]}'
+        assert scanner.feed(text) == [{"title": 'a } ] " {', "x": 1}]
+
+    def test_other_arrays_are_ignored(self):
+        """Test that only the array under the requested key is scanned."""
+        scanner = _ArrayItemScanner("milestones")
+        text = '```json\n{"tips": [{"a": 1}], "milestones": [{"b": 2}]}\n```'
+        assert scanner.feed(text) == [{"b": 2}]
+
+    def test_truncated_input(self):
+        """Test that an unfinished item is not returned."""
+        scanner = _ArrayItemScanner("milestones")
+        assert scanner.feed('{"milestones": [{"title": "A"}, {"title": "B') == [{"title": "A"}]
+
+
+class TestGenerateJsonStream:
+    """Tests for GeminiClient.generate_json_stream."""
+
+    def test_yields_items_and_returns_full_response(self):
+        """Test that items are yielded as they complete and the full object is returned."""
+        chunks = ['{"summary": "s", "milestones": [{"title": "A"}', ', {"title": "B"}]}']
+        items, result = _stream(GeminiClient(), chunks)
+        assert items == [{"title": "A"}, {"title": "B"}]
+        assert result == {"summary": "s", "milestones": [{"title": "A"}, {"title": "B"}]}
+
+    def test_truncated_response_is_repaired(self):
+        """Test that a cut-off response streams complete items and returns the repaired rest."""
+        chunks = ['{"milestones": [{"title": "A"}, {"title": "B']
+        items, result = _stream(GeminiClient(), chunks)
+        assert items == [{"title": "A"}]
+        assert result == {"milestones": [{"title": "A"}]}
+
+    def test_unrepairable_response_raises_after_complete_items(self):
+        """Test that complete items still stream before an unparseable end raises."""
+        client = GeminiClient()
+        client.generate_stream = lambda *args, **kw: iter(
+            ['```json\n{"milestones": [{"title": "A"}, {"title": "B']
+        )
+        stream = client.generate_json_stream("prompt")
+        assert next(stream) == {"title": "A"}
+        with pytest.raises(LLMResponseError):
+            next(stream)
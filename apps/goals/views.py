@@ -5,21 +5,26 @@ Flow for creating a goal with AI-generated plan:
 1. POST /goals/ - Create goal with title, description, target_date
 2. POST /goals/{id}/generate_questions/ - LLM generates contextual questions
 3. POST /goals/{id}/submit_answers/ - User submits answers, LLM generates plan
+   (or POST /goals/{id}/submit_answers_stream/ to receive milestones as SSE events)
 4. POST /goals/{id}/apply_plan/ - Create Milestone objects from plan
 """
 
+import json
 import logging
 from datetime import date, datetime, time, timedelta
 from typing import List, Optional
 
 from core.llm import RateLimitExceeded
+from django.http import StreamingHttpResponse
 from django.utils import timezone
 from drf_spectacular.utils import extend_schema, extend_schema_view
 from pydantic import ValidationError as PydanticValidationError
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.renderers import BaseRenderer
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 
 from apps.tasks.models import Task
 
@@ -41,13 +46,31 @@ from .serializers import (
 from .services import (
     generate_plan,
     generate_questions,
+    milestone_to_dict,
     save_plan,
     save_questions,
+    stream_plan,
 )
 
 logger = logging.getLogger(__name__)
 
 
+class EventStreamRenderer(BaseRenderer):
+    """Lets clients send ``Accept: text/event-stream`` to streaming actions."""
+
+    media_type = "text/event-stream"
+    format = "sse"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        # Only reached for non-streamed responses, i.e. errors raised before streaming starts
+        return _sse_event("error", data)
+
+
+def _sse_event(event: str, data: dict) -> str:
+    """Format one Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
 # Priority weights for due date distribution (higher = gets more time earlier)
 PRIORITY_WEIGHTS = {
     "high": 1,  # First in the milestone
@@ -132,6 +155,7 @@ def calculate_task_due_dates(
     destroy=extend_schema(tags=["Goals"]),
     generate_questions=extend_schema(tags=["Goals"]),
     submit_answers=extend_schema(tags=["Goals"]),
+    submit_answers_stream=extend_schema(tags=["Goals"]),
     apply_plan=extend_schema(tags=["Goals"]),
     complete=extend_schema(tags=["Goals"]),
     pause=extend_schema(tags=["Goals"]),
@@ -162,7 +186,7 @@ class GoalViewSet(viewsets.ModelViewSet):
             return GoalListSerializer
         elif self.action == "create":
             return GoalCreateSerializer
-        elif self.action == "submit_answers":
+        elif self.action in ("submit_answers", "submit_answers_stream"):
             return SubmitAnswersSerializer
         return GoalDetailSerializer
 
@@ -241,37 +265,10 @@ class GoalViewSet(viewsets.ModelViewSet):
             The generated plan with milestones, tips, and motivation.
         """
         goal = self.get_object()
-
-        # Validate input
-        serializer = SubmitAnswersSerializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
-        answers = serializer.validated_data["answers"]
-        num_milestones = serializer.validated_data.get("num_milestones", 5)
-        tasks_per_milestone = serializer.validated_data.get("tasks_per_milestone", 3)
-
-        # Update goal status to planning
-        goal.status = Goal.Status.PLANNING
-        goal.planning_answers = answers
-        goal.save(update_fields=["status", "planning_answers", "updated_at"])
+        plan_kwargs = self._start_planning(goal, request)
 
         try:
-            # Map answers to entities
-            answer_entities = [
-                QuestionAnswer(
-                    question_id=a["question_id"],
-                    question=a["question"],
-                    answer=a["answer"],
-                )
-                for a in answers
-            ]
-
-            plan = generate_plan(
-                goal=goal,
-                answers=answer_entities,
-                user_id=request.user.id,
-                num_milestones=num_milestones,
-                tasks_per_milestone=tasks_per_milestone,
-            )
+            plan = generate_plan(goal=goal, user_id=request.user.id, **plan_kwargs)
             save_plan(goal, plan)
 
             return Response(
@@ -308,6 +305,102 @@ class GoalViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_503_SERVICE_UNAVAILABLE,
             )
 
+    @action(
+        detail=True,
+        methods=["post"],
+        renderer_classes=[EventStreamRenderer, *api_settings.DEFAULT_RENDERER_CLASSES],
+    )
+    def submit_answers_stream(self, request, pk=None):
+        """
+        Streaming variant of submit_answers, as Server-Sent Events.
+
+        Takes the same request body. Emits a ``milestone`` event for each
+        milestone as soon as the LLM has written it, then a ``plan`` event with
+        the saved plan, or an ``error`` event shaped like submit_answers' error
+        responses.
+        """
+        goal = self.get_object()
+        plan_kwargs = self._start_planning(goal, request)
+
+        def events():
+            stream = stream_plan(goal=goal, user_id=request.user.id, **plan_kwargs)
+            saved = False
+            try:
+                while True:
+                    try:
+                        milestone = next(stream)
+                    except StopIteration as stop:
+                        plan = stop.value
+                        break
+                    yield _sse_event("milestone", milestone_to_dict(milestone))
+
+                save_plan(goal, plan)
+                saved = True
+                yield _sse_event("plan", {"success": True, "plan": goal.llm_generated_plan})
+
+            except RateLimitExceeded as e:
+                yield _sse_event(
+                    "error",
+                    {
+                        "success": False,
+                        "error": "rate_limit_exceeded",
+                        "message": str(e),
+                        "retry_after": e.retry_after,
+                    },
+                )
+
+            except Exception as e:
+                logger.error("Error streaming plan for goal %s: %s", goal.id, e)
+                yield _sse_event(
+                    "error",
+                    {
+                        "success": False,
+                        "error": "llm_error",
+                        "message": "Failed to generate plan. Please try again later.",
+                    },
+                )
+
+            finally:
+                # Also reached on client disconnect (GeneratorExit at a yield)
+                stream.close()
+                if not saved:
+                    goal.status = Goal.Status.DRAFT
+                    goal.save(update_fields=["status", "updated_at"])
+
+        response = StreamingHttpResponse(events(), content_type=EventStreamRenderer.media_type)
+        response["Cache-Control"] = "no-cache"
+        # Stop nginx from buffering the stream
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+    def _start_planning(self, goal: Goal, request) -> dict:
+        """
+        Validate submitted answers and move the goal into planning.
+
+        Returns the keyword arguments for generate_plan()/stream_plan().
+        """
+        serializer = SubmitAnswersSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        answers = serializer.validated_data["answers"]
+
+        # Update goal status to planning
+        goal.status = Goal.Status.PLANNING
+        goal.planning_answers = answers
+        goal.save(update_fields=["status", "planning_answers", "updated_at"])
+
+        return {
+            "answers": [
+                QuestionAnswer(
+                    question_id=a["question_id"],
+                    question=a["question"],
+                    answer=a["answer"],
+                )
+                for a in answers
+            ],
+            "num_milestones": serializer.validated_data.get("num_milestones", 5),
+            "tasks_per_milestone": serializer.validated_data.get("tasks_per_milestone", 3),
+        }
+
     # =========================================================================
     # Step 4: Apply the plan
     # =========================================================================
@@ -191,6 +191,7 @@ class NotificationAdmin(admin.ModelAdmin):
         colors = {
             "pending": "#ffc107",
             "scheduled": "#17a2b8",
+            "sending": "#007bff",
             "sent": "#28a745",
             "failed": "#dc3545",
             "cancelled": "#6c757d",
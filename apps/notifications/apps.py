@@ -6,4 +6,5 @@ class NotificationsConfig(AppConfig):
     name = "apps.notifications"
     verbose_name = "Notifications"
 
-
+    def ready(self):
+        import apps.notifications.signals  # noqa: F401
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-16 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("notifications", "0003_alter_notification_notification_type"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="notification",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("pending", "Pending"),
+                    ("scheduled", "Scheduled"),
+                    ("sending", "Sending"),
+                    ("sent", "Sent"),
+                    ("failed", "Failed"),
+                    ("cancelled", "Cancelled"),
+                ],
+                default="pending",
+                max_length=20,
+                verbose_name="status",
+            ),
+        ),
+    ]
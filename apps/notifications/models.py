@@ -159,6 +159,7 @@ class Notification(TimeStampedModel):
 
         PENDING = "pending", _("Pending")
         SCHEDULED = "scheduled", _("Scheduled")
+        SENDING = "sending", _("Sending")  # Claimed by a worker, see claim_notification()
         SENT = "sent", _("Sent")
         FAILED = "failed", _("Failed")
         CANCELLED = "cancelled", _("Cancelled")
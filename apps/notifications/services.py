@@ -18,7 +18,8 @@ from core.llm.prompts import (
     format_motivational_quotes_prompt,
 )
 from django.conf import settings
-from django.db.models import QuerySet
+from django.db import transaction
+from django.db.models import F, QuerySet
 from django.utils import timezone
 from pydantic import ValidationError
 
@@ -200,6 +201,85 @@ def get_pending_notifications() -> QuerySet[Notification]:
     ).select_related("user", "task")
 
 
+def get_unqueued_upcoming_notifications(window: timedelta) -> QuerySet[Notification]:
+    """
+    Pending notifications due within ``window`` that weren't queued at creation.
+
+    Notifications created within NOTIFICATION_ETA_HORIZON of their send time
+    already have an ETA task (see signals.py), so they are excluded here.
+    """
+    now = timezone.now()
+    horizon = timedelta(seconds=settings.NOTIFICATION_ETA_HORIZON)
+    return Notification.objects.filter(
+        status=Notification.Status.PENDING,
+        scheduled_for__gt=now,
+        scheduled_for__lte=now + window,
+        created_at__lt=F("scheduled_for") - horizon,
+    )
+
+
+def claim_notification(notification_id: int) -> bool:
+    """
+    Claim a pending notification for sending.
+
+    The notification moves to SENDING in a single UPDATE, so when its ETA task
+    and the send_pending_notifications sweep race, only one of them sends it.
+    Returns False if it isn't pending (anymore).
+    """
+    return bool(
+        Notification.objects.filter(
+            pk=notification_id,
+            status=Notification.Status.PENDING,
+        ).update(status=Notification.Status.SENDING, updated_at=timezone.now())
+    )
+
+
+def claim_due_notifications(limit: int) -> list[Notification]:
+    """
+    Claim up to ``limit`` due notifications for sending, like claim_notification().
+
+    Rows locked by a concurrent sweep are skipped rather than waited for.
+    """
+    with transaction.atomic():
+        notifications = list(
+            get_pending_notifications().select_for_update(skip_locked=True, of=("self",))[:limit]
+        )
+        Notification.objects.filter(pk__in=[n.pk for n in notifications]).update(
+            status=Notification.Status.SENDING, updated_at=timezone.now()
+        )
+    for notification in notifications:
+        notification.status = Notification.Status.SENDING
+    return notifications
+
+
+def release_unsent_notifications(notifications: list[Notification]) -> int:
+    """
+    Return claimed notifications that were neither sent nor failed to PENDING.
+
+    Covers the ones skipped for quiet hours and any left by an error mid-batch,
+    so a later sweep picks them up again.
+    """
+    return Notification.objects.filter(
+        pk__in=[n.pk for n in notifications],
+        status=Notification.Status.SENDING,
+    ).update(status=Notification.Status.PENDING, updated_at=timezone.now())
+
+
+def release_stale_claims() -> int:
+    """
+    Return notifications stuck in SENDING to PENDING.
+
+    release_unsent_notifications() doesn't run when a worker is killed mid-send
+    (SIGKILL, hard time limit, OOM); a claim older than NOTIFICATION_CLAIM_TIMEOUT
+    can't belong to a live task anymore.
+    """
+    cutoff = timezone.now() - timedelta(seconds=settings.NOTIFICATION_CLAIM_TIMEOUT)
+    return Notification.objects.filter(
+        status=Notification.Status.SENDING,
+        updated_at__lt=cutoff,
+    ).update(status=Notification.Status.PENDING, updated_at=timezone.now())
+
+
 def cancel_task_notifications(task: Task) -> int:
     """Cancel all pending notifications for a task."""
     return Notification.objects.filter(
@@ -713,6 +793,8 @@ def generate_motivational_quotes(
             prompt=prompt,
             user_id=user.id,
             system_prompt=MOTIVATIONAL_QUOTES_SYSTEM,
+            # Same tasks on a later day should still get fresh quotes
+            cache_ttl=0,
         )
         parsed = LLMQuotesResponseDTO(**response)
     except RateLimitExceeded as exc:
@@ -0,0 +1,37 @@
+"""
+Signals for the Notifications app.
+
+Queues a delivery task for each new notification instead of waiting for a poll.
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import Notification
+from .tasks import send_single_notification
+
+
+@receiver(post_save, sender=Notification)
+def notification_created(sender, instance, created, **kwargs):
+    """
+    Queue a send at the notification's scheduled time.
+
+    Only pending notifications due within NOTIFICATION_ETA_HORIZON are queued
+    here; later ones are picked up by the send_pending_notifications sweep.
+    """
+    if not created or instance.status != Notification.Status.PENDING:
+        return
+
+    horizon = timedelta(seconds=settings.NOTIFICATION_ETA_HORIZON)
+    if instance.scheduled_for > timezone.now() + horizon:
+        return
+
+    notification_id, eta = instance.pk, instance.scheduled_for
+    transaction.on_commit(
+        lambda: send_single_notification.apply_async(args=[notification_id], eta=eta)
+    )
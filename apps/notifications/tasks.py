@@ -2,7 +2,8 @@
 Celery tasks for notification processing.
 
 These tasks are scheduled by Celery Beat:
-- send_pending_notifications: Every minute
+- send_pending_notifications: Every 10 minutes (due notifications are pushed
+  by ETA-scheduled send_single_notification tasks; this is the safety net)
 - schedule_daily_reminders: Daily at 6:00 AM
 - schedule_motivational_quotes: Daily at 9:00 AM and 5:00 PM
 - cleanup_old_notifications: Weekly on Sunday at 3:00 AM
@@ -19,34 +20,53 @@ from apps.tasks.models import Task
 
 from .models import Notification, NotificationPreference
 from .services import (
+    claim_due_notifications,
+    claim_notification,
     generate_motivational_quotes,
-    get_pending_notifications,
+    get_unqueued_upcoming_notifications,
+    release_stale_claims,
+    release_unsent_notifications,
     schedule_daily_recurring_reminder,
     send_push_notifications_batch,
 )
 
 logger = logging.getLogger(__name__)
 
+# Matches the send-pending-notifications beat schedule in config/celery.py
+PENDING_SWEEP_INTERVAL = timedelta(minutes=10)
+
 
 @shared_task(bind=True, max_retries=3, default_retry_delay=60)
 def send_pending_notifications(self):
     """
-    Send all pending notifications that are due.
+    Send pending notifications that were missed and queue the ones due soon.
 
-    Runs every minute via Celery Beat.
-    Processes notifications in batches for efficiency.
+    Runs every 10 minutes via Celery Beat.
+    Overdue notifications (skipped in quiet hours, lost ETA tasks) are sent in
+    batches; ones due before the next sweep that were created too far ahead to
+    get an ETA task at creation are queued for their send time now.
     """
     try:
-        pending = list(
-            get_pending_notifications()[: settings.EXPO_PUSH_BATCH_SIZE]
-        )
+        stale = release_stale_claims()
+        if stale:
+            logger.warning(f"Released {stale} notifications left in SENDING by a dead worker")
+
+        upcoming = get_unqueued_upcoming_notifications(PENDING_SWEEP_INTERVAL)
+        for notification_id, scheduled_for in upcoming.values_list("id", "scheduled_for"):
+            send_single_notification.apply_async(args=[notification_id], eta=scheduled_for)
+
+        # Claimed, so an ETA task firing meanwhile doesn't send them again
+        pending = claim_due_notifications(settings.EXPO_PUSH_BATCH_SIZE)
 
         if not pending:
             logger.debug("No pending notifications to send")
             return {"sent": 0, "failed": 0, "skipped": 0}
 
         logger.info(f"Processing {len(pending)} pending notifications")
-        results = send_push_notifications_batch(pending)
+        try:
+            results = send_push_notifications_batch(pending)
+        finally:
+            release_unsent_notifications(pending)
 
         logger.info(
             f"Notification results: sent={results['sent']}, "
@@ -158,7 +178,9 @@ def schedule_motivational_quotes(self, hour_label: str | None = None):
     """
     try:
         now = timezone.now()
-        reminder_key = f"motivational_quote_{now.date().isoformat()}_{hour_label or now.strftime('%H%M')}"
+        # Slot from the local beat hour ("09:00"/"17:00"), stable across retries within the hour
+        hour_label = hour_label or timezone.localtime(now).strftime("%H:00")
+        reminder_key = f"motivational_quote_{now.date().isoformat()}_{hour_label}"
 
         prefs = (
             NotificationPreference.objects.filter(
@@ -222,18 +244,25 @@ def send_single_notification(self, notification_id: int):
     Can be called directly for immediate notification sending.
     """
     try:
-        notification = Notification.objects.select_related("user", "task").get(
-            id=notification_id
-        )
-
-        if notification.status != Notification.Status.PENDING:
-            logger.warning(
-                f"Notification {notification_id} is not pending "
-                f"(status={notification.status})"
+        # Claimed, so the send_pending_notifications sweep doesn't send it too
+        if not claim_notification(notification_id):
+            status = (
+                Notification.objects.filter(id=notification_id)
+                .values_list("status", flat=True)
+                .first()
             )
+            if status is None:
+                raise Notification.DoesNotExist
+            logger.warning(f"Notification {notification_id} is not pending (status={status})")
             return {"success": False, "reason": "not_pending"}
 
-        results = send_push_notifications_batch([notification])
+        notification = Notification.objects.select_related("user", "task").get(
+            id=notification_id
+        )
+        try:
+            results = send_push_notifications_batch([notification])
+        finally:
+            release_unsent_notifications([notification])
         return {
             "success": results["sent"] > 0,
             "results": results,
@@ -0,0 +1,184 @@
+"""
+Tests for queueing and sending notifications.
+"""
+
+from datetime import timedelta
+from unittest import mock
+
+import pytest
+from django.utils import timezone
+
+from apps.notifications import services
+from apps.notifications.models import Notification, NotificationPreference
+from apps.notifications.services import claim_due_notifications
+from apps.notifications.tasks import send_pending_notifications, send_single_notification
+from apps.users.models import User
+
+
+@pytest.fixture
+def user():
+    """Create a user with push enabled and quiet hours off."""
+    user = User.objects.create_user(email="notify@example.com", password="testpass123")
+    NotificationPreference.objects.create(
+        user=user,
+        push_token="ExponentPushToken[test]",
+        quiet_hours_enabled=False,
+    )
+    return user
+
+
+@pytest.fixture
+def make_notification(user):
+    """Return a function creating a pending notification due at a given time."""
+
+    def make(scheduled_for=None, **kwargs):
+        return Notification.objects.create(
+            user=user,
+            title="Reminder",
+            body="Do the thing",
+            scheduled_for=scheduled_for or timezone.now() - timedelta(minutes=1),
+            **kwargs,
+        )
+
+    return make
+
+
+@pytest.fixture
+def apply_async():
+    """Record send_single_notification.apply_async calls instead of queueing."""
+    with mock.patch.object(send_single_notification, "apply_async") as apply_async:
+        yield apply_async
+
+
+@pytest.fixture
+def expo():
+    """Fake the Expo Push API, accepting every notification."""
+    with mock.patch.object(services.requests, "post") as post:
+        post.side_effect = lambda url, json, **kwargs: mock.Mock(
+            json=lambda: {"data": [{"status": "ok"} for _ in json]}
+        )
+        yield post
+
+
+@pytest.mark.django_db
+class TestNotificationCreatedSignal:
+    """Tests for queueing an ETA send when a notification is created."""
+
+    def test_due_soon_is_queued(
+        self, make_notification, apply_async, django_capture_on_commit_callbacks
+    ):
+        """Test that a notification due within the horizon is queued for its send time."""
+        scheduled_for = timezone.now() + timedelta(minutes=5)
+        with django_capture_on_commit_callbacks(execute=True):
+            notification = make_notification(scheduled_for=scheduled_for)
+        apply_async.assert_called_once_with(args=[notification.id], eta=scheduled_for)
+
+    def test_beyond_horizon_is_not_queued(
+        self, make_notification, apply_async, settings, django_capture_on_commit_callbacks
+    ):
+        """Test that a notification due after the horizon is left to the sweep."""
+        scheduled_for = timezone.now() + timedelta(seconds=settings.NOTIFICATION_ETA_HORIZON + 60)
+        with django_capture_on_commit_callbacks(execute=True) as callbacks:
+            make_notification(scheduled_for=scheduled_for)
+        assert callbacks == []
+        apply_async.assert_not_called()
+
+    def test_only_new_pending_notifications_are_queued(
+        self, make_notification, apply_async, django_capture_on_commit_callbacks
+    ):
+        """Test that updates and non-pending notifications aren't queued."""
+        with django_capture_on_commit_callbacks(execute=True) as callbacks:
+            make_notification(status=Notification.Status.CANCELLED)
+        assert callbacks == []
+
+        notification = make_notification()
+        with django_capture_on_commit_callbacks(execute=True) as callbacks:
+            notification.save()
+        assert callbacks == []
+        apply_async.assert_not_called()
+
+
+@pytest.mark.django_db
+class TestSendPendingNotifications:
+    """Tests for the send_pending_notifications sweep."""
+
+    def test_sends_due_notifications(self, make_notification, expo):
+        """Test that due notifications are sent in one batch."""
+        first, second = make_notification(), make_notification()
+        assert send_pending_notifications() == {"sent": 2, "failed": 0, "skipped": 0}
+        assert expo.call_count == 1
+
+        for notification in (first, second):
+            notification.refresh_from_db()
+            assert notification.status == Notification.Status.SENT
+
+    def test_queues_upcoming_notifications(self, make_notification, apply_async, expo):
+        """Test that notifications created too far ahead are queued once due soon."""
+        scheduled_for = timezone.now() + timedelta(minutes=5)
+        notification = make_notification(scheduled_for=scheduled_for)
+        Notification.objects.filter(pk=notification.pk).update(
+            created_at=timezone.now() - timedelta(days=1)
+        )
+
+        send_pending_notifications()
+        apply_async.assert_called_once_with(args=[notification.id], eta=scheduled_for)
+
+    def test_skips_claimed_notifications(self, make_notification, expo):
+        """Test that the sweep doesn't send a notification an ETA task is sending."""
+        notification = make_notification(status=Notification.Status.SENDING)
+        assert send_pending_notifications() == {"sent": 0, "failed": 0, "skipped": 0}
+        expo.assert_not_called()
+
+        notification.refresh_from_db()
+        assert notification.status == Notification.Status.SENDING
+
+    def test_stale_claims_are_released_and_sent(self, make_notification, settings, expo):
+        """Test that a notification left in SENDING by a dead worker is sent again."""
+        stale = make_notification(status=Notification.Status.SENDING)
+        fresh = make_notification(status=Notification.Status.SENDING)
+        claimed_at = timezone.now() - timedelta(seconds=settings.NOTIFICATION_CLAIM_TIMEOUT + 60)
+        Notification.objects.filter(pk=stale.pk).update(updated_at=claimed_at)
+
+        assert send_pending_notifications() == {"sent": 1, "failed": 0, "skipped": 0}
+
+        stale.refresh_from_db()
+        fresh.refresh_from_db()
+        assert stale.status == Notification.Status.SENT
+        assert fresh.status == Notification.Status.SENDING
+
+    def test_quiet_hours_release_the_claim(self, user, make_notification, expo):
+        """Test that notifications skipped for quiet hours go back to pending."""
+        NotificationPreference.objects.filter(user=user).update(quiet_hours_enabled=True)
+        notification = make_notification()
+
+        with mock.patch.object(services, "is_in_quiet_hours", return_value=True):
+            assert send_pending_notifications() == {"sent": 0, "failed": 0, "skipped": 1}
+
+        notification.refresh_from_db()
+        assert notification.status == Notification.Status.PENDING
+
+
+@pytest.mark.django_db
+class TestSendSingleNotification:
+    """Tests for the send_single_notification ETA task."""
+
+    def test_sends_pending_notification(self, make_notification, expo):
+        """Test that a pending notification is claimed and sent."""
+        notification = make_notification()
+        assert send_single_notification(notification.id)["success"]
+
+        notification.refresh_from_db()
+        assert notification.status == Notification.Status.SENT
+
+    def test_notification_claimed_by_sweep_is_not_sent_twice(self, make_notification, expo):
+        """Test that the ETA task backs off once the sweep has claimed the notification."""
+        notification = make_notification()
+        assert claim_due_notifications(10) == [notification]
+
+        result = send_single_notification(notification.id)
+        assert result == {"success": False, "reason": "not_pending"}
+        expo.assert_not_called()
+
+    def test_missing_notification(self, expo):
+        """Test that an unknown ID is reported as not found."""
+        assert send_single_notification(0) == {"success": False, "reason": "not_found"}
@@ -290,6 +290,43 @@ class TaskSerializer(serializers.ModelSerializer):
         return instance
 
 
+TASK_LIST_FIELDS = (
+    "id",
+    "title",
+    "description",
+    "status",
+    "priority",
+    "due_date",
+    "start_datetime",
+    "end_datetime",
+    "completed_at",
+    "is_recurring",
+    "recurrence_period",
+    "recurrence_target_count",
+    "is_active",
+    "is_overdue",
+    "is_period_complete",
+    # Group
+    "group",
+    # Visibility
+    "visibility",
+    # Goal/target fields
+    "unit_type",
+    "custom_unit_name",
+    "target_value",
+    "goal_display",
+    "unit_display_name",
+    "milestone_ids",
+    "goal_icon",
+    "created_at",
+)
+
+# Concrete Task columns backing TASK_LIST_FIELDS, for QuerySet.only() on list endpoints.
+# Computed fields (is_overdue, goal_display, ...) only read columns already in this list.
+_TASK_COLUMNS = frozenset(field.name for field in Task._meta.concrete_fields)
+TASK_LIST_ONLY_FIELDS = tuple(name for name in TASK_LIST_FIELDS if name in _TASK_COLUMNS)
+
+
 class TaskListSerializer(serializers.ModelSerializer):
     """
     Lightweight serializer for listing tasks.
@@ -312,36 +349,7 @@ class TaskListSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Task
-        fields = [
-            "id",
-            "title",
-            "description",
-            "status",
-            "priority",
-            "due_date",
-            "start_datetime",
-            "end_datetime",
-            "completed_at",
-            "is_recurring",
-            "recurrence_period",
-            "recurrence_target_count",
-            "is_active",
-            "is_overdue",
-            "is_period_complete",
-            # Group
-            "group",
-            # Visibility
-            "visibility",
-            # Goal/target fields
-            "unit_type",
-            "custom_unit_name",
-            "target_value",
-            "goal_display",
-            "unit_display_name",
-            "milestone_ids",
-            "goal_icon",
-            "created_at",
-        ]
+        fields = list(TASK_LIST_FIELDS)
 
     @extend_schema_field(serializers.CharField(allow_null=True))
     def get_status(self, obj) -> Optional[str]:
@@ -438,7 +446,10 @@ class SyncCompletionsResponseSerializer(serializers.Serializer):
     added = serializers.IntegerField(help_text="Number of completions added")
     removed = serializers.IntegerField(help_text="Number of completions removed")
     total = serializers.IntegerField(help_text="Total completions after sync")
-    task = TaskWithCompletionsSerializer()
+    task = TaskWithCompletionsSerializer(
+        required=False,
+        help_text="Full task with recent completions (only with ?include=task)",
+    )
 
 
 class BulkCompletionAdditionSerializer(serializers.Serializer):
@@ -8,19 +8,31 @@ from rest_framework import status
 from rest_framework.test import APIClient
 
 from apps.tasks.models import Task
+from apps.users.models import User
 
 
 @pytest.fixture
-def api_client():
-    """Return an API client."""
-    return APIClient()
+def user():
+    """Create and return the user that owns the test tasks."""
+    return User.objects.create_user(email="tasks@example.com", password="testpass123")
 
 
 @pytest.fixture
-def sample_task():
+def api_client(user):
+    """Return an API client authenticated as ``user``."""
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+
+@pytest.fixture
+def sample_task(user):
     """Create and return a sample task."""
     return Task.objects.create(
-        title="Sample Task", description="Sample description", priority=Task.Priority.HIGH
+        user=user,
+        title="Sample Task",
+        description="Sample description",
+        priority=Task.Priority.HIGH,
     )
 
 
@@ -68,7 +80,8 @@ class TestTaskAPI:
         assert response.status_code == status.HTTP_200_OK
         sample_task.refresh_from_db()
         assert sample_task.title == "Updated Task"
-        assert sample_task.status == Task.Status.IN_PROGRESS
+        # status is read-only on TaskSerializer; it changes through update_status
+        assert sample_task.status == Task.Status.TODO
 
     def test_partial_update_task(self, api_client, sample_task):
         """Test partial update of a task."""
@@ -108,11 +121,11 @@ class TestTaskAPI:
         sample_task.refresh_from_db()
         assert sample_task.status == Task.Status.IN_PROGRESS
 
-    def test_task_stats(self, api_client):
+    def test_task_stats(self, api_client, user):
         """Test the stats endpoint."""
-        Task.objects.create(title="Task 1", status=Task.Status.TODO)
-        Task.objects.create(title="Task 2", status=Task.Status.COMPLETED)
-        Task.objects.create(title="Task 3", status=Task.Status.IN_PROGRESS)
+        Task.objects.create(user=user, title="Task 1", status=Task.Status.TODO)
+        Task.objects.create(user=user, title="Task 2", status=Task.Status.COMPLETED)
+        Task.objects.create(user=user, title="Task 3", status=Task.Status.IN_PROGRESS)
 
         url = reverse("tasks:task-stats")
         response = api_client.get(url)
@@ -123,10 +136,10 @@ class TestTaskAPI:
         assert "completed" in response.data
         assert "in_progress" in response.data
 
-    def test_filter_by_status(self, api_client):
+    def test_filter_by_status(self, api_client, user):
         """Test filtering tasks by status."""
-        Task.objects.create(title="Todo Task", status=Task.Status.TODO)
-        Task.objects.create(title="Completed Task", status=Task.Status.COMPLETED)
+        Task.objects.create(user=user, title="Todo Task", status=Task.Status.TODO)
+        Task.objects.create(user=user, title="Completed Task", status=Task.Status.COMPLETED)
 
         url = reverse("tasks:task-list")
         response = api_client.get(url, {"status": "todo"})
@@ -135,10 +148,10 @@ class TestTaskAPI:
         for task in response.data["results"]:
             assert task["status"] == "todo"
 
-    def test_search_tasks(self, api_client):
+    def test_search_tasks(self, api_client, user):
         """Test searching tasks."""
-        Task.objects.create(title="Python Learning", description="Learn Django")
-        Task.objects.create(title="JavaScript Project", description="React app")
+        Task.objects.create(user=user, title="Python Learning", description="Learn Django")
+        Task.objects.create(user=user, title="JavaScript Project", description="React app")
 
         url = reverse("tasks:task-list")
         response = api_client.get(url, {"search": "Python"})
@@ -147,6 +160,16 @@ class TestTaskAPI:
         assert len(response.data["results"]) >= 1
         assert "Python" in response.data["results"][0]["title"]
 
+    def test_unauthenticated_request_is_rejected(self):
+        """Anonymous requests are rejected before any queryset work."""
+        url = reverse("tasks:task-list")
+        response = APIClient().get(url)
+
+        assert response.status_code in (
+            status.HTTP_401_UNAUTHORIZED,
+            status.HTTP_403_FORBIDDEN,
+        )
+
     def test_create_task_empty_title(self, api_client):
         """Test that creating a task with empty title fails."""
         url = reverse("tasks:task-list")
@@ -161,8 +184,9 @@ class TestBulkUpdateCompletions:
     """Tests for the bulk_update_completions action."""
 
     @pytest.fixture
-    def recurring_task(self):
+    def recurring_task(self, user):
         return Task.objects.create(
+            user=user,
             title="Daily push-ups",
             is_recurring=True,
             recurrence_period=Task.RecurrencePeriod.DAILY,
@@ -225,13 +249,14 @@ class TestBulkUpdateCompletions:
         assert TaskCompletion.objects.filter(id=keep2.id).exists()
         assert not TaskCompletion.objects.filter(id=delete_me.id).exists()
 
-    def test_cross_task_removal_is_skipped(self, api_client, recurring_task):
+    def test_cross_task_removal_is_skipped(self, api_client, user, recurring_task):
         """Sending a completion ID that belongs to *another* task must
         not delete it — id ends up in skipped_ids instead."""
         from apps.tasks.models import TaskCompletion
         from django.utils import timezone
 
         other_task = Task.objects.create(
+            user=user,
             title="Other recurring",
             is_recurring=True,
             recurrence_period=Task.RecurrencePeriod.DAILY,
@@ -303,3 +328,42 @@ class TestBulkUpdateCompletions:
         )
 
 
+@pytest.mark.django_db
+class TestCompletionWriteResponses:
+    """Write actions return only the delta unless ?include=task is passed."""
+
+    @pytest.fixture
+    def recurring_task(self, user):
+        return Task.objects.create(
+            user=user,
+            title="Daily reading",
+            is_recurring=True,
+            recurrence_period=Task.RecurrencePeriod.DAILY,
+        )
+
+    def test_record_completion_returns_delta(self, api_client, recurring_task):
+        url = reverse("tasks:task-record-completion", args=[recurring_task.id])
+        response = api_client.post(url, data={"notes": "done"}, format="json")
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data["task_id"] == recurring_task.id
+        assert response.data["completion"]["notes"] == "done"
+        assert "task" not in response.data
+
+    def test_record_completion_include_task(self, api_client, recurring_task):
+        url = reverse("tasks:task-record-completion", args=[recurring_task.id])
+        response = api_client.post(f"{url}?include=task", data={}, format="json")
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data["task"]["id"] == recurring_task.id
+
+    def test_sync_completions_returns_counts(self, api_client, recurring_task):
+        url = reverse("tasks:task-sync-completions", args=[recurring_task.id])
+        response = api_client.post(
+            url, data={"dates": ["2026-04-01", "2026-04-02"]}, format="json"
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["added"] == 2
+        assert response.data["removed"] == 0
+        assert "task" not in response.data
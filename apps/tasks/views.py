@@ -3,7 +3,7 @@ Views for the Tasks app.
 """
 
 from django.db import transaction
-from django.db.models import Case, IntegerField, Value, When
+from django.db.models import Case, Count, IntegerField, Q, Value, When
 from django.utils import timezone
 from django_filters.rest_framework import DjangoFilterBackend
 from drf_spectacular.utils import extend_schema, extend_schema_view
@@ -15,6 +15,7 @@ from rest_framework.response import Response
 from .filters import TaskCompletionFilter, TaskFilter
 from .models import Task, TaskCompletion, TaskGroup
 from .serializers import (
+    TASK_LIST_ONLY_FIELDS,
     BulkUpdateCompletionsResponseSerializer,
     BulkUpdateCompletionsSerializer,
     SyncCompletionsResponseSerializer,
@@ -39,6 +40,12 @@ PRIORITY_ORDER = Case(
     output_field=IntegerField(),
 )
 
+# Enum members resolved once at import for the stats/bulk endpoints
+_STATUSES = tuple(Task.Status)
+_PRIORITIES = tuple(Task.Priority)
+_PERIODS = tuple(Task.RecurrencePeriod)
+_STATUS_SET = frozenset(s.value for s in _STATUSES)
+
 
 class TaskOrderingFilter(filters.OrderingFilter):
     """
@@ -139,14 +146,21 @@ class TaskViewSet(viewsets.ModelViewSet):
         Filter tasks by authenticated user.
         By default, excludes inactive recurring tasks unless include_inactive=true is passed.
         """
-        from django.db.models import Q
+        # Anonymous requests only get here where DEFAULT_PERMISSION_CLASSES allows
+        # them (local settings); return before any filtering or prefetching
+        if getattr(self, "swagger_fake_view", False) or not self.request.user.is_authenticated:
+            return Task.objects.none()
+
+        queryset = (
+            super()
+            .get_queryset()
+            .filter(user=self.request.user)
+            .prefetch_related("milestone_links__milestone__goal")
+        )
 
-        queryset = super().get_queryset().prefetch_related("milestone_links__milestone__goal")
-        if self.request.user.is_authenticated:
-            queryset = queryset.filter(user=self.request.user)
-        else:
-            # Return empty queryset for unauthenticated users
-            queryset = queryset.none()
+        # List endpoints only load the columns TaskListSerializer renders
+        if self.action in ("list", "recurring"):
+            queryset = queryset.only(*TASK_LIST_ONLY_FIELDS)
 
         # Exclude inactive recurring tasks by default
         # Check if include_inactive parameter is explicitly set to true
@@ -160,6 +174,10 @@ class TaskViewSet(viewsets.ModelViewSet):
 
         return queryset
 
+    def _wants_task_in_response(self):
+        """Whether the client asked for the full task via ``?include=task``."""
+        return self.request.query_params.get("include") == "task"
+
     def perform_create(self, serializer):
         """Associate task with current user if authenticated."""
         user = self.request.user if self.request.user.is_authenticated else None
@@ -196,6 +214,8 @@ class TaskViewSet(viewsets.ModelViewSet):
         Record a completion for a recurring task.
 
         This allows recording completions with optional notes and duration.
+        Returns only the new completion; pass ``?include=task`` to also get
+        the full task with its recent completions.
 
         Expected payload:
         {
@@ -216,13 +236,13 @@ class TaskViewSet(viewsets.ModelViewSet):
 
         completion = TaskCompletion.objects.create(task=task, **serializer.validated_data)
 
-        return Response(
-            {
-                "completion": TaskCompletionSerializer(completion).data,
-                "task": TaskWithCompletionsSerializer(task).data,
-            },
-            status=status.HTTP_201_CREATED,
-        )
+        data = {
+            "completion": TaskCompletionSerializer(completion).data,
+            "task_id": task.pk,
+        }
+        if self._wants_task_in_response():
+            data["task"] = TaskWithCompletionsSerializer(task).data
+        return Response(data, status=status.HTTP_201_CREATED)
 
     @action(detail=True, methods=["get"])
     def completions(self, request, pk=None):
@@ -238,7 +258,8 @@ class TaskViewSet(viewsets.ModelViewSet):
                 {"error": "This task is not a recurring task"}, status=status.HTTP_400_BAD_REQUEST
             )
 
-        completions = task.completions.all()
+        # TaskCompletionSerializer reads task.title; join it up front
+        completions = task.completions.select_related("task")
 
         # Optional date filtering
         start_date = request.query_params.get("start_date")
@@ -257,6 +278,12 @@ class TaskViewSet(viewsets.ModelViewSet):
         serializer = TaskCompletionSerializer(completions, many=True)
         return Response(serializer.data)
 
+    @staticmethod
+    def _count_by(queryset, field):
+        """Return ``{value: count}`` for ``field`` using a single GROUP BY query."""
+        rows = queryset.order_by().prefetch_related(None).values(field).annotate(n=Count("id"))
+        return {row[field]: row["n"] for row in rows}
+
     @action(detail=False, methods=["get"])
     def stats(self, request):
         """
@@ -265,40 +292,17 @@ class TaskViewSet(viewsets.ModelViewSet):
         queryset = self.get_queryset()
         recurring_tasks = queryset.filter(is_recurring=True)
 
+        by_status = self._count_by(queryset, "status")
+        by_priority = self._count_by(queryset, "priority")
+        by_period = self._count_by(recurring_tasks, "recurrence_period")
+
         stats = {
-            "total": queryset.count(),
-            "todo": queryset.filter(status=Task.Status.TODO).count(),
-            "in_progress": queryset.filter(status=Task.Status.IN_PROGRESS).count(),
-            "completed": queryset.filter(status=Task.Status.COMPLETED).count(),
-            "archived": queryset.filter(status=Task.Status.ARCHIVED).count(),
-            "by_priority": {
-                "low": queryset.filter(priority=Task.Priority.LOW).count(),
-                "medium": queryset.filter(priority=Task.Priority.MEDIUM).count(),
-                "high": queryset.filter(priority=Task.Priority.HIGH).count(),
-                "urgent": queryset.filter(priority=Task.Priority.URGENT).count(),
-            },
+            "total": sum(by_status.values()),
+            **{s.value: by_status.get(s.value, 0) for s in _STATUSES},
+            "by_priority": {p.value: by_priority.get(p.value, 0) for p in _PRIORITIES},
             "recurring": {
-                "total": recurring_tasks.count(),
-                "by_period": {
-                    "daily": recurring_tasks.filter(
-                        recurrence_period=Task.RecurrencePeriod.DAILY
-                    ).count(),
-                    "weekly": recurring_tasks.filter(
-                        recurrence_period=Task.RecurrencePeriod.WEEKLY
-                    ).count(),
-                    "biweekly": recurring_tasks.filter(
-                        recurrence_period=Task.RecurrencePeriod.BIWEEKLY
-                    ).count(),
-                    "monthly": recurring_tasks.filter(
-                        recurrence_period=Task.RecurrencePeriod.MONTHLY
-                    ).count(),
-                    "quarterly": recurring_tasks.filter(
-                        recurrence_period=Task.RecurrencePeriod.QUARTERLY
-                    ).count(),
-                    "yearly": recurring_tasks.filter(
-                        recurrence_period=Task.RecurrencePeriod.YEARLY
-                    ).count(),
-                },
+                "total": sum(by_period.values()),
+                "by_period": {p.value: by_period.get(p.value, 0) for p in _PERIODS},
                 "total_completions": TaskCompletion.objects.filter(
                     task__in=recurring_tasks
                 ).count(),
@@ -323,7 +327,7 @@ class TaskViewSet(viewsets.ModelViewSet):
         if not task_ids:
             return Response({"error": "No task IDs provided"}, status=status.HTTP_400_BAD_REQUEST)
 
-        if new_status not in dict(Task.Status.choices):
+        if new_status not in _STATUS_SET:
             return Response({"error": "Invalid status"}, status=status.HTTP_400_BAD_REQUEST)
 
         updated = self.get_queryset().filter(id__in=task_ids).update(status=new_status)
@@ -356,6 +360,8 @@ class TaskViewSet(viewsets.ModelViewSet):
         Accepts a list of dates. Compares with existing completions:
         - Adds new completions for dates not in DB
         - Removes completions for dates not in the list
+
+        The full task is only included in the response with ``?include=task``.
         """
         from datetime import datetime as dt
 
@@ -375,14 +381,10 @@ class TaskViewSet(viewsets.ModelViewSet):
 
         incoming_dates = set(dates)
 
-        # Get existing completion dates
-        existing_completions = task.completions.all()
-        existing_dates = {}
-        for completion in existing_completions:
-            date = completion.completed_at.date()
-            existing_dates[date] = completion
-
-        existing_date_set = set(existing_dates.keys())
+        # Map existing completion dates to their PKs (plain tuples, no model instances)
+        rows = task.completions.values_list("id", "completed_at")
+        existing_by_date = {completed_at.date(): pk for pk, completed_at in rows}
+        existing_date_set = existing_by_date.keys()
 
         # Dates to add (in incoming but not existing)
         dates_to_add = incoming_dates - existing_date_set
@@ -391,9 +393,8 @@ class TaskViewSet(viewsets.ModelViewSet):
         dates_to_remove = existing_date_set - incoming_dates
 
         added_count = 0
-        removed_count = 0
 
-        # Add new completions
+        # Add new completions (one by one so post_save handlers still fire)
         for date in dates_to_add:
             TaskCompletion.objects.create(
                 task=task,
@@ -404,18 +405,20 @@ class TaskViewSet(viewsets.ModelViewSet):
             added_count += 1
 
         # Remove completions
-        for date in dates_to_remove:
-            existing_dates[date].delete()
-            removed_count += 1
-
-        return Response(
-            {
-                "added": added_count,
-                "removed": removed_count,
-                "total": len(incoming_dates),
-                "task": TaskWithCompletionsSerializer(task).data,
-            }
-        )
+        removed_count = len(dates_to_remove)
+        if dates_to_remove:
+            task.completions.filter(
+                id__in=[existing_by_date[date] for date in dates_to_remove]
+            ).delete()
+
+        data = {
+            "added": added_count,
+            "removed": removed_count,
+            "total": len(incoming_dates),
+        }
+        if self._wants_task_in_response():
+            data["task"] = TaskWithCompletionsSerializer(task).data
+        return Response(data)
 
     @extend_schema(
         request=BulkUpdateCompletionsSerializer,
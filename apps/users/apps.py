@@ -9,3 +9,6 @@ class UsersConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.users"
     verbose_name = "Users"
+
+    def ready(self):
+        import apps.users.signals  # noqa: F401
@@ -0,0 +1,47 @@
+"""JWT authentication that caches validated access tokens in-process."""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+VALIDATED_TOKEN_CACHE_SIZE = 10_000
+VALIDATED_TOKEN_CACHE_TTL = 15 * 60  # seconds, further capped by each token's own exp
+
+_validated_tokens = OrderedDict()
+_validated_tokens_lock = threading.Lock()
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that skips signature verification for recently seen tokens.
+
+    Only successfully validated tokens are cached, keyed by a digest of the raw
+    token, and an entry never outlives the token's ``exp`` claim.
+    """
+
+    def get_validated_token(self, raw_token):
+        key = hashlib.blake2b(raw_token, digest_size=16).digest()
+        now = time.time()
+
+        with _validated_tokens_lock:
+            entry = _validated_tokens.get(key)
+            if entry is not None:
+                token, expires_at = entry
+                if expires_at > now:
+                    _validated_tokens.move_to_end(key)
+                    return token
+                del _validated_tokens[key]
+
+        # Raises InvalidToken on failure, so rejected tokens are never cached
+        token = super().get_validated_token(raw_token)
+        expires_at = min(token.get("exp", now), now + VALIDATED_TOKEN_CACHE_TTL)
+
+        with _validated_tokens_lock:
+            _validated_tokens[key] = (token, expires_at)
+            if len(_validated_tokens) > VALIDATED_TOKEN_CACHE_SIZE:
+                _validated_tokens.popitem(last=False)
+
+        return token
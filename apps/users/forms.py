@@ -2,12 +2,29 @@
 Custom forms for email-based authentication.
 """
 
+import hashlib
+
 from django import forms
+from django.conf import settings
 from django.contrib.auth import authenticate, get_user_model
 from django.contrib.auth.forms import AuthenticationForm
+from django.core.cache import cache
 
 User = get_user_model()
 
+# How long a failed (email, password) pair skips the password hasher
+FAILED_LOGIN_CACHE_TIMEOUT = 30
+
+
+def _failed_login_cache_key(email, password):
+    """Keyed digest of the credentials so no raw password material is cached."""
+    digest = hashlib.blake2b(
+        f"{email}:{password}".encode(),
+        digest_size=16,
+        key=settings.SECRET_KEY.encode()[:64],
+    ).hexdigest()
+    return f"authneg:{digest}"
+
 
 class EmailAuthenticationForm(AuthenticationForm):
     """
@@ -49,8 +66,15 @@ class EmailAuthenticationForm(AuthenticationForm):
         if email is not None and password:
             # Normalize email to lowercase for case-insensitive comparison
             email = email.lower().strip()
+
+            # Repeated identical bad guesses skip the expensive password hash
+            cache_key = _failed_login_cache_key(email, password)
+            if cache.get(cache_key):
+                raise self.get_invalid_login_error()
+
             self.user_cache = authenticate(self.request, username=email, password=password)
             if self.user_cache is None:
+                cache.set(cache_key, 1, timeout=FAILED_LOGIN_CACHE_TIMEOUT)
                 raise self.get_invalid_login_error()
             else:
                 self.confirm_login_allowed(self.user_cache)
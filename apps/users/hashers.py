@@ -0,0 +1,20 @@
+"""Password hashers tuned for interactive login latency."""
+
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+
+
+class TunedPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """
+    PBKDF2-SHA256 whose iteration count can be lowered with ``PASSWORD_HASH_ITERATIONS``.
+
+    Without that setting it uses Django's own count, so production hashes are
+    never re-encoded at a lower one. Keeps the ``pbkdf2_sha256`` algorithm name,
+    so existing hashes still verify and are re-encoded at this iteration count
+    on the user's next successful login.
+    """
+
+    @property
+    def iterations(self):
+        iterations = getattr(settings, "PASSWORD_HASH_ITERATIONS", None)
+        return iterations or PBKDF2PasswordHasher.iterations
@@ -2,6 +2,7 @@
 Management command to create OAuth2 application for the mobile app.
 """
 
+from django.contrib.auth.hashers import check_password
 from django.core.management.base import BaseCommand
 
 # type: ignore
@@ -57,7 +58,7 @@ class Command(BaseCommand):
             "algorithm": Application.NO_ALGORITHM,  # Using PKCE instead
         }
 
-        app, created = Application.objects.update_or_create(
+        app, created = Application.objects.get_or_create(
             client_id=client_id,
             defaults=app_defaults,
         )
@@ -65,32 +66,61 @@ class Command(BaseCommand):
         if created:
             self.stdout.write(self.style.SUCCESS(f"✅ Created OAuth2 application"))
         else:
-            self.stdout.write(self.style.SUCCESS(f"✅ Updated OAuth2 application"))
+            # Only write when something actually changed (avoids a no-op UPDATE on re-runs)
+            changed = [
+                field
+                for field, value in app_defaults.items()
+                if self._field_differs(app, field, value)
+            ]
+            if changed:
+                for field in changed:
+                    setattr(app, field, app_defaults[field])
+                app.save(update_fields=changed)
+                self.stdout.write(self.style.SUCCESS(f"✅ Updated OAuth2 application"))
+            else:
+                self.stdout.write(self.style.SUCCESS(f"✅ OAuth2 application already up to date"))
 
-        self.stdout.write("")
-        self.stdout.write("=" * 60)
-        self.stdout.write(self.style.HTTP_INFO("OAuth2 Application Details:"))
-        self.stdout.write("=" * 60)
-        self.stdout.write(f"  Name:              {app.name}")
-        self.stdout.write(f"  Client ID:         {app.client_id}")
-        self.stdout.write(f"  Client Type:       Public (mobile app)")
-        self.stdout.write(f"  Grant Type:        Authorization Code + PKCE")
-        self.stdout.write(f"  Redirect URI:      {app.redirect_uris}")
-        self.stdout.write(f"  Skip Authorization: {app.skip_authorization}")
-        self.stdout.write("=" * 60)
-        self.stdout.write("")
-        self.stdout.write(self.style.HTTP_INFO("OAuth2 Endpoints:"))
-        self.stdout.write("=" * 60)
-        self.stdout.write("  Authorization:     /o/authorize/")
-        self.stdout.write("  Token:             /o/token/")
-        self.stdout.write("  UserInfo:          /o/userinfo/")
-        self.stdout.write("  Discovery:         /o/.well-known/openid-configuration/")
-        self.stdout.write("  Revoke:            /o/revoke_token/")
-        self.stdout.write("=" * 60)
-        self.stdout.write("")
+        separator = "=" * 60
+        details = "\n".join(
+            [
+                "",
+                separator,
+                self.style.HTTP_INFO("OAuth2 Application Details:"),
+                separator,
+                f"  Name:              {app.name}",
+                f"  Client ID:         {app.client_id}",
+                "  Client Type:       Public (mobile app)",
+                "  Grant Type:        Authorization Code + PKCE",
+                f"  Redirect URI:      {app.redirect_uris}",
+                f"  Skip Authorization: {app.skip_authorization}",
+                separator,
+                "",
+                self.style.HTTP_INFO("OAuth2 Endpoints:"),
+                separator,
+                "  Authorization:     /o/authorize/",
+                "  Token:             /o/token/",
+                "  UserInfo:          /o/userinfo/",
+                "  Discovery:         /o/.well-known/openid-configuration/",
+                "  Revoke:            /o/revoke_token/",
+                separator,
+                "",
+            ]
+        )
+        self.stdout.write(details)
         self.stdout.write(
             self.style.WARNING(
                 "Note: This is a PUBLIC client. Authentication uses PKCE "
                 "(Proof Key for Code Exchange) for security."
             )
         )
+
+    @staticmethod
+    def _field_differs(app, field, value):
+        """Compare a stored Application field with its desired value."""
+        current = getattr(app, field)
+        if current == value:
+            return False
+        # client_secret is stored hashed when hash_client_secret is enabled
+        if field == "client_secret" and getattr(app, "hash_client_secret", False):
+            return not check_password(value, current)
+        return True
@@ -3,8 +3,11 @@ Custom OAuth2 Validator for OpenID Connect support.
 Provides user claims for ID tokens.
 """
 
+from django.contrib.auth import authenticate, get_user_model
 from oauth2_provider.oauth2_validators import OAuth2Validator
 
+User = get_user_model()
+
 
 class CustomOAuth2Validator(OAuth2Validator):
     """
@@ -12,47 +15,61 @@ class CustomOAuth2Validator(OAuth2Validator):
     and supports email-based authentication.
     """
 
-    # Define OIDC claims
-    oidc_claim_scope = OAuth2Validator.oidc_claim_scope
-    oidc_claim_scope.update(
-        {
-            "profile": [
-                "name",
-                "given_name",
-                "family_name",
-                "preferred_username",
-                "updated_at",
-            ],
-            "email": [
-                "email",
-                "email_verified",
-            ],
-        }
-    )
+    # Define OIDC claims (a fresh dict; the parent's mapping is left untouched)
+    oidc_claim_scope = {
+        **OAuth2Validator.oidc_claim_scope,
+        "profile": (
+            "name",
+            "given_name",
+            "family_name",
+            "preferred_username",
+            "updated_at",
+        ),
+        "email": (
+            "email",
+            "email_verified",
+        ),
+    }
+
+    # Relations read while building claims. Claims currently come straight from
+    # User fields; if one ever moves to a related model (e.g. a profile), list it
+    # here so the user is loaded once with a JOIN instead of a query per claim.
+    claims_select_related = ()
+
+    def _get_claims_user(self, request):
+        """Return request.user, re-fetched with claims_select_related once per request."""
+        user = request.user
+        if self.claims_select_related and not getattr(request, "_claims_user_loaded", False):
+            user = User.objects.select_related(*self.claims_select_related).get(pk=user.pk)
+            request.user = user
+            request._claims_user_loaded = True
+        return user
 
     def get_additional_claims(self, request):
         """
         Return additional claims for the ID token.
         Called when 'openid' scope is requested.
         """
-        user = request.user
+        user = self._get_claims_user(request)
+        email = user.email
         claims = {}
 
         if "profile" in request.scopes:
+            date_joined = user.date_joined
             claims.update(
                 {
-                    "name": user.get_full_name() or user.email,
+                    "name": user.get_full_name() or email,
                     "given_name": user.first_name,
                     "family_name": user.last_name,
-                    "preferred_username": user.email,
-                    "updated_at": int(user.date_joined.timestamp()) if user.date_joined else None,
+                    "preferred_username": email,
+                    "updated_at": int(date_joined.timestamp()) if date_joined else None,
                 }
             )
 
         if "email" in request.scopes:
             claims.update(
                 {
-                    "email": user.email,
+                    "email": email,
                     "email_verified": user.is_active,  # Treat active as verified
                 }
             )
@@ -65,15 +82,16 @@ class CustomOAuth2Validator(OAuth2Validator):
         """
         claims = super().get_userinfo_claims(request)
 
-        user = request.user
+        user = self._get_claims_user(request)
+        email = user.email
         claims.update(
             {
                 "sub": str(user.id),
-                "name": user.get_full_name() or user.email,
+                "name": user.get_full_name() or email,
                 "given_name": user.first_name,
                 "family_name": user.last_name,
-                "preferred_username": user.email,
-                "email": user.email,
+                "preferred_username": email,
+                "email": email,
                 "email_verified": user.is_active,
             }
         )
@@ -85,8 +103,6 @@ class CustomOAuth2Validator(OAuth2Validator):
         Validate username (email) and password for Resource Owner Password Grant.
         Note: This grant type is discouraged for mobile apps, use Authorization Code + PKCE instead.
         """
-        from django.contrib.auth import authenticate
-
         # Authenticate using email as username
         user = authenticate(username=username, password=password)
 
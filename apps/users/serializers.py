@@ -1,58 +1,50 @@
 """Serializers for user authentication and management."""
 
+import copy
+
 from django.contrib.auth import authenticate, get_user_model
 from django.contrib.auth.password_validation import validate_password
+from django.core.cache import cache
+from django.utils import timezone
 from rest_framework import serializers
+from rest_framework.exceptions import AuthenticationFailed
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 
 User = get_user_model()
 
+USER_REPR_CACHE_TIMEOUT = 300  # seconds
+LAST_LOGIN_UPDATE_INTERVAL = 60  # seconds
 
-class EmailTokenObtainPairSerializer(TokenObtainPairSerializer):
-    """Custom JWT serializer that uses email instead of username."""
 
-    username_field = "email"
+def _touch_last_login(user):
+    """Write last_login at most once per interval per user (replaces UPDATE_LAST_LOGIN)."""
+    if cache.add(f"last_login:{user.pk}", 1, timeout=LAST_LOGIN_UPDATE_INTERVAL):
+        User.objects.filter(pk=user.pk).update(last_login=timezone.now())
 
-    def validate(self, attrs):
-        # Use email for authentication
-        email = attrs.get("email")
-        password = attrs.get("password")
 
-        if email and password:
-            # Normalize email to lowercase for case-insensitive comparison
-            email = email.lower().strip()
+class EmailTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """
+    Custom JWT serializer that uses email instead of username.
 
-            # Authenticate using email (passed as username to backend)
-            user = authenticate(
-                request=self.context.get("request"),
-                username=email,
-                password=password,
-            )
+    Authentication is left to TokenObtainPairSerializer.validate, which passes
+    ``email`` through to EmailBackend, so each login verifies the password once.
+    """
 
-            if not user:
-                raise serializers.ValidationError(
-                    "No active account found with the given credentials.",
-                    code="no_active_account",
-                )
+    username_field = "email"
+    default_error_messages = {
+        "no_active_account": "No active account found with the given credentials.",
+    }
 
-            if not user.is_active:
-                raise serializers.ValidationError(
-                    "User account is disabled.",
-                    code="no_active_account",
-                )
-        else:
+    def validate(self, attrs):
+        try:
+            data = super().validate(attrs)
+        except AuthenticationFailed:
+            # Bad credentials are a 400 on this endpoint, not simplejwt's 401
             raise serializers.ValidationError(
-                'Must include "email" and "password".',
-                code="authorization",
+                self.error_messages["no_active_account"],
+                code="no_active_account",
             )
-
-        refresh = self.get_token(user)
-
-        data = {
-            "refresh": str(refresh),
-            "access": str(refresh.access_token),
-        }
-
+        _touch_last_login(self.user)
         return data
 
     @classmethod
@@ -65,7 +57,23 @@ class EmailTokenObtainPairSerializer(TokenObtainPairSerializer):
         return token
 
 
-class UserSerializer(serializers.ModelSerializer):
+class CachedFieldsMixin:
+    """
+    Build ModelSerializer fields once per class and give each instance a deep copy.
+
+    Only for serializers whose fields don't depend on the instance or context.
+    """
+
+    def get_fields(self):
+        cls = type(self)
+        fields = cls.__dict__.get("_cached_fields")
+        if fields is None:
+            fields = super().get_fields()
+            cls._cached_fields = fields
+        return copy.deepcopy(fields)
+
+
+class UserSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """Serializer for user profile."""
 
     class Meta:
@@ -74,6 +82,19 @@ class UserSerializer(serializers.ModelSerializer):
         read_only_fields = ("id", "email", "date_joined", "is_active")
 
 
+def user_repr_cache_key(user_id):
+    return f"user:repr:{user_id}"
+
+
+def get_cached_user_repr(user):
+    """UserSerializer output for ``user``, cached until the user row changes."""
+    return cache.get_or_set(
+        user_repr_cache_key(user.pk),
+        lambda: dict(UserSerializer(user).data),
+        USER_REPR_CACHE_TIMEOUT,
+    )
+
+
 class UserRegistrationSerializer(serializers.ModelSerializer):
     """Serializer for user registration."""
 
@@ -100,10 +121,8 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         validated_data.pop("password_confirm")
-        user = User.objects.create_user(**validated_data)
-        user.is_active = False
-        user.save(update_fields=["is_active"])
-        return user
+        # Inactive until the email is verified; set up front so it's a single INSERT
+        return User.objects.create_user(is_active=False, **validated_data)
 
 
 class LoginSerializer(serializers.Serializer):
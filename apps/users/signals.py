@@ -0,0 +1,30 @@
+"""
+Signals for the Users app.
+
+Keeps the cached UserSerializer representation in sync with the user row.
+"""
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .serializers import UserSerializer, user_repr_cache_key
+
+User = get_user_model()
+
+_SERIALIZED_FIELDS = frozenset(UserSerializer.Meta.fields)
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, update_fields=None, **kwargs):
+    """Drop the cached representation unless only unserialized columns changed."""
+    # e.g. last_login on every login, password on change-password
+    if update_fields is not None and _SERIALIZED_FIELDS.isdisjoint(update_fields):
+        return
+    cache.delete(user_repr_cache_key(instance.pk))
+
+
+@receiver(post_delete, sender=User)
+def user_deleted(sender, instance, **kwargs):
+    cache.delete(user_repr_cache_key(instance.pk))
@@ -0,0 +1,89 @@
+"""
+Tests for CachedJWTAuthentication.
+"""
+
+from unittest import mock
+
+import pytest
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.users import authentication
+from apps.users.authentication import CachedJWTAuthentication
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    """Start each test with an empty token cache."""
+    authentication._validated_tokens.clear()
+    yield
+    authentication._validated_tokens.clear()
+
+
+@pytest.fixture
+def validate():
+    """Spy on the uncached JWTAuthentication.get_validated_token."""
+    with mock.patch.object(
+        JWTAuthentication,
+        "get_validated_token",
+        autospec=True,
+        side_effect=JWTAuthentication.get_validated_token,
+    ) as validate:
+        yield validate
+
+
+def _raw_token():
+    return str(AccessToken()).encode()
+
+
+class TestCachedJWTAuthentication:
+    """Tests for CachedJWTAuthentication.get_validated_token."""
+
+    def test_valid_token_is_cached(self, validate):
+        """Test that a validated token is served from the cache the second time."""
+        auth = CachedJWTAuthentication()
+        raw = _raw_token()
+        token = auth.get_validated_token(raw)
+        assert auth.get_validated_token(raw) is token
+        assert validate.call_count == 1
+
+    def test_expired_entry_is_revalidated(self, validate, monkeypatch):
+        """Test that a cache entry past its TTL is dropped and the token checked again."""
+        auth = CachedJWTAuthentication()
+        raw = _raw_token()
+        now = authentication.time.time()
+        auth.get_validated_token(raw)
+
+        later = now + authentication.VALIDATED_TOKEN_CACHE_TTL + 1
+        monkeypatch.setattr(authentication.time, "time", lambda: later)
+        auth.get_validated_token(raw)
+        assert validate.call_count == 2
+        assert len(authentication._validated_tokens) == 1
+
+    def test_invalid_token_is_not_cached(self, validate):
+        """Test that a rejected token is validated (and rejected) every time."""
+        auth = CachedJWTAuthentication()
+        for _ in range(2):
+            with pytest.raises(InvalidToken):
+                auth.get_validated_token(b"not-a-token")
+        assert validate.call_count == 2
+        assert not authentication._validated_tokens
+
+    def test_least_recently_used_token_is_evicted(self, validate, monkeypatch):
+        """Test that the cache holds at most VALIDATED_TOKEN_CACHE_SIZE tokens, evicting LRU."""
+        monkeypatch.setattr(authentication, "VALIDATED_TOKEN_CACHE_SIZE", 2)
+        auth = CachedJWTAuthentication()
+        first, second, third = _raw_token(), _raw_token(), _raw_token()
+
+        auth.get_validated_token(first)
+        auth.get_validated_token(second)
+        auth.get_validated_token(first)  # now more recently used than second
+        auth.get_validated_token(third)
+        assert len(authentication._validated_tokens) == 2
+        assert validate.call_count == 3
+
+        auth.get_validated_token(first)
+        assert validate.call_count == 3
+        auth.get_validated_token(second)
+        assert validate.call_count == 4
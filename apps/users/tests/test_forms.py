@@ -0,0 +1,61 @@
+"""
+Tests for the email login form.
+"""
+
+from unittest import mock
+
+import pytest
+from django.core.cache import cache
+
+from apps.users import forms
+from apps.users.forms import EmailAuthenticationForm
+from apps.users.models import User
+
+EMAIL = "login@example.com"
+PASSWORD = "testpass123"
+
+
+@pytest.fixture
+def user():
+    """Create and return an active user."""
+    cache.clear()
+    yield User.objects.create_user(email=EMAIL, password=PASSWORD)
+    cache.clear()
+
+
+@pytest.fixture
+def authenticate():
+    """Spy on the authenticate() call made by the form."""
+    with mock.patch.object(forms, "authenticate", wraps=forms.authenticate) as authenticate:
+        yield authenticate
+
+
+def _login(email, password):
+    return EmailAuthenticationForm(data={"username": email, "password": password})
+
+
+@pytest.mark.django_db
+class TestEmailAuthenticationForm:
+    """Tests for EmailAuthenticationForm."""
+
+    def test_correct_password(self, user):
+        """Test that the right credentials log the user in."""
+        form = _login(EMAIL, PASSWORD)
+        assert form.is_valid()
+        assert form.get_user() == user
+
+    def test_cached_failure_short_circuits(self, user, authenticate):
+        """Test that repeating a failed login is rejected without checking the password."""
+        assert not _login(EMAIL, "wrong-password").is_valid()
+        form = _login(EMAIL.upper(), "wrong-password")
+        assert not form.is_valid()
+        assert form.errors["__all__"] == [EmailAuthenticationForm.error_messages["invalid_login"]]
+        assert authenticate.call_count == 1
+
+    def test_correct_password_after_cached_failure(self, user, authenticate):
+        """Test that a cached failure doesn't block the right password for the same email."""
+        assert not _login(EMAIL, "wrong-password").is_valid()
+        form = _login(EMAIL, PASSWORD)
+        assert form.is_valid()
+        assert form.get_user() == user
+        assert authenticate.call_count == 2
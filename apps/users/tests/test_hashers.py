@@ -0,0 +1,27 @@
+"""
+Tests for the tuned password hasher.
+"""
+
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+
+from apps.users.hashers import TunedPBKDF2PasswordHasher
+
+
+class TestTunedPBKDF2PasswordHasher:
+    """Tests for TunedPBKDF2PasswordHasher.iterations."""
+
+    def test_defaults_to_django_iterations(self, settings):
+        """Test that without PASSWORD_HASH_ITERATIONS the count isn't lowered."""
+        if hasattr(settings, "PASSWORD_HASH_ITERATIONS"):
+            del settings.PASSWORD_HASH_ITERATIONS
+        hasher = TunedPBKDF2PasswordHasher()
+        assert hasher.iterations == PBKDF2PasswordHasher.iterations
+        django_hasher = PBKDF2PasswordHasher()
+        assert not hasher.must_update(django_hasher.encode("secret", django_hasher.salt()))
+
+    def test_setting_overrides_iterations(self, settings):
+        """Test that PASSWORD_HASH_ITERATIONS sets the count for new hashes."""
+        settings.PASSWORD_HASH_ITERATIONS = 1000
+        assert TunedPBKDF2PasswordHasher().encode("secret", "salt").startswith(
+            "pbkdf2_sha256$1000$"
+        )
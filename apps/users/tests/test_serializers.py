@@ -0,0 +1,86 @@
+"""
+Tests for user serializers.
+"""
+
+from unittest import mock
+
+import pytest
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+from django.core.cache import cache
+
+from apps.users.models import User
+from apps.users.serializers import EmailTokenObtainPairSerializer, _touch_last_login
+
+EMAIL = "token@example.com"
+PASSWORD = "testpass123"
+
+
+@pytest.fixture
+def user():
+    """Create and return an active user."""
+    cache.clear()
+    yield User.objects.create_user(email=EMAIL, password=PASSWORD)
+    cache.clear()
+
+
+def _last_login(user):
+    return User.objects.values_list("last_login", flat=True).get(pk=user.pk)
+
+
+@pytest.mark.django_db
+class TestEmailTokenObtainPairSerializer:
+    """Tests for the email login serializer."""
+
+    def test_password_is_checked_once(self, user):
+        """Test that a login runs the password hasher exactly once."""
+        with mock.patch.object(
+            PBKDF2PasswordHasher, "verify", autospec=True, side_effect=PBKDF2PasswordHasher.verify
+        ) as verify:
+            serializer = EmailTokenObtainPairSerializer(data={"email": EMAIL, "password": PASSWORD})
+            assert serializer.is_valid(), serializer.errors
+        assert verify.call_count == 1
+        assert {"access", "refresh"} <= set(serializer.validated_data)
+
+    def test_email_is_case_insensitive(self, user):
+        """Test that the email is matched regardless of case and surrounding spaces."""
+        serializer = EmailTokenObtainPairSerializer(
+            data={"email": f" {EMAIL.upper()} ", "password": PASSWORD}
+        )
+        assert serializer.is_valid(), serializer.errors
+
+    def test_bad_credentials_are_a_validation_error(self, user):
+        """Test that a wrong password fails validation (400) rather than authentication (401)."""
+        serializer = EmailTokenObtainPairSerializer(data={"email": EMAIL, "password": "wrong"})
+        assert not serializer.is_valid()
+        assert serializer.errors["non_field_errors"][0].code == "no_active_account"
+
+
+@pytest.mark.django_db
+class TestTouchLastLogin:
+    """Tests for the throttled last_login update."""
+
+    def test_token_obtain_sets_last_login(self, user):
+        """Test that obtaining a token records the login."""
+        serializer = EmailTokenObtainPairSerializer(data={"email": EMAIL, "password": PASSWORD})
+        assert serializer.is_valid(), serializer.errors
+        assert _last_login(user) is not None
+
+    def test_written_once_per_interval(self, user, django_assert_num_queries):
+        """Test that repeated logins within the interval write last_login only once."""
+        with django_assert_num_queries(1):
+            _touch_last_login(user)
+        first = _last_login(user)
+
+        with django_assert_num_queries(0):
+            _touch_last_login(user)
+        assert _last_login(user) == first
+
+    def test_written_again_after_interval(self, user):
+        """Test that last_login is written again once the interval has passed."""
+        _touch_last_login(user)
+        User.objects.filter(pk=user.pk).update(last_login=None)
+
+        # What LAST_LOGIN_UPDATE_INTERVAL expiring does to the marker
+        cache.delete(f"last_login:{user.pk}")
+        _touch_last_login(user)
+        assert _last_login(user) is not None
@@ -0,0 +1,53 @@
+"""
+Tests for keeping the cached user representation in sync.
+"""
+
+import pytest
+from django.core.cache import cache
+
+from apps.users.models import User
+from apps.users.serializers import get_cached_user_repr, user_repr_cache_key
+
+
+@pytest.fixture
+def user():
+    """Create a user whose representation is cached."""
+    cache.clear()
+    user = User.objects.create_user(email="repr@example.com", password="testpass123")
+    get_cached_user_repr(user)
+    yield user
+    cache.clear()
+
+
+def _is_cached(user):
+    return cache.get(user_repr_cache_key(user.pk)) is not None
+
+
+@pytest.mark.django_db
+class TestUserReprInvalidation:
+    """Tests for the user_saved and user_deleted receivers."""
+
+    def test_unserialized_fields_keep_cache(self, user):
+        """Test that saving only columns UserSerializer doesn't show keeps the cache."""
+        user.save(update_fields=["last_login"])
+        user.set_password("newpass123")
+        user.save(update_fields=["password"])
+        assert _is_cached(user)
+
+    def test_serialized_field_invalidates(self, user):
+        """Test that saving a serialized column drops the cached representation."""
+        user.first_name = "Ada"
+        user.save(update_fields=["first_name", "last_login"])
+        assert not _is_cached(user)
+        assert get_cached_user_repr(user)["first_name"] == "Ada"
+
+    def test_full_save_invalidates(self, user):
+        """Test that a save without update_fields drops the cached representation."""
+        user.save()
+        assert not _is_cached(user)
+
+    def test_delete_invalidates(self, user):
+        """Test that deleting the user drops the cached representation."""
+        pk = user.pk
+        user.delete()
+        assert cache.get(user_repr_cache_key(pk)) is None
@@ -22,6 +22,7 @@ from .serializers import (
     LoginSerializer,
     UserRegistrationSerializer,
     UserSerializer,
+    get_cached_user_repr,
 )
 
 User = get_user_model()
@@ -163,7 +164,7 @@ class RegisterView(generics.CreateAPIView):
                     "User registered successfully. "
                     "Please confirm your email address before signing in."
                 ),
-                "user": UserSerializer(user).data,
+                "user": get_cached_user_repr(user),
             },
             status=status.HTTP_201_CREATED,
         )
@@ -192,7 +193,7 @@ class LoginView(APIView):
         return Response(
             {
                 "message": "Login successful.",
-                "user": UserSerializer(user).data,
+                "user": get_cached_user_repr(user),
             },
             status=status.HTTP_200_OK,
         )
@@ -326,7 +327,7 @@ class ChangePasswordView(APIView):
 
         user = request.user
         user.set_password(serializer.validated_data["new_password"])
-        user.save()
+        user.save(update_fields=["password"])
 
         return Response(
             {"message": "Password changed successfully."},
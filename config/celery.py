@@ -26,10 +26,10 @@ app.autodiscover_tasks()
 # =============================================================================
 
 app.conf.beat_schedule = {
-    # Send pending notifications every minute
+    # Safety-net sweep; due notifications are pushed by ETA tasks queued on creation
     "send-pending-notifications": {
         "task": "apps.notifications.tasks.send_pending_notifications",
-        "schedule": 60.0,  # Every 60 seconds
+        "schedule": 600.0,  # Every 10 minutes
     },
     # Schedule daily recurring reminders at 6:00 AM
     "schedule-daily-reminders": {
@@ -41,23 +41,17 @@ app.conf.beat_schedule = {
         "task": "apps.notifications.tasks.cleanup_old_notifications",
         "schedule": crontab(hour=3, minute=0, day_of_week=0),
     },
-    # Motivational quotes twice daily
-    "schedule-motivational-quotes-morning": {
+    # Motivational quotes twice daily (9:00 and 17:00); the task derives the slot label
+    "schedule-motivational-quotes": {
         "task": "apps.notifications.tasks.schedule_motivational_quotes",
-        "schedule": crontab(hour=9, minute=0),
-        "args": ("09:00",),
-    },
-    "schedule-motivational-quotes-evening": {
-        "task": "apps.notifications.tasks.schedule_motivational_quotes",
-        "schedule": crontab(hour=17, minute=0),
-        "args": ("17:00",),
+        "schedule": crontab(hour="9,17", minute=0),
     },
 }
 
 app.conf.timezone = "Europe/Warsaw"
 
 
-@app.task(bind=True, ignore_result=True)
+@app.task(bind=True)
 def debug_task(self):
     """Debug task for testing Celery connection."""
     print(f"Request: {self.request!r}")
@@ -40,6 +40,7 @@ LOCAL_APPS = [
     "apps.groups",
     "apps.stats",
     "apps.workouts",
+    "core.llm",
 ]
 
 INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
@@ -114,6 +115,15 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Password hashing - first entry hashes new passwords, the rest only verify legacy hashes
+PASSWORD_HASHERS = [
+    "apps.users.hashers.TunedPBKDF2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "django.contrib.auth.hashers.Argon2PasswordHasher",
+    "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+    "django.contrib.auth.hashers.ScryptPasswordHasher",
+]
+
 # Internationalization
 LANGUAGE_CODE = "pl"
 
@@ -137,11 +147,23 @@ MEDIA_ROOT = BASE_DIR / "media"
 # Default primary key field type
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+# Cache with Redis - shared across workers, so DRF throttle histories and the LLM
+# rate limits count every request for a user, not just the ones a process saw
+CACHES = {
+    "default": {
+        "BACKEND": "django_redis.cache.RedisCache",
+        "LOCATION": config("REDIS_URL", default="redis://127.0.0.1:6379/1"),
+        "OPTIONS": {
+            "CLIENT_CLASS": "django_redis.client.DefaultClient",
+        },
+    }
+}
+
 # Django REST Framework
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
         "oauth2_provider.contrib.rest_framework.OAuth2Authentication",
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "apps.users.authentication.CachedJWTAuthentication",
         "rest_framework.authentication.SessionAuthentication",
     ],
     "DEFAULT_PERMISSION_CLASSES": [
@@ -155,9 +177,14 @@ REST_FRAMEWORK = {
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 20,
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    # BrowsableAPIRenderer is added in local settings only
     "DEFAULT_RENDERER_CLASSES": [
-        "rest_framework.renderers.JSONRenderer",
-        "rest_framework.renderers.BrowsableAPIRenderer",
+        "drf_orjson_renderer.renderers.ORJSONRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "drf_orjson_renderer.parsers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
     ],
     "DEFAULT_THROTTLE_CLASSES": [
         "rest_framework.throttling.AnonRateThrottle",
@@ -206,7 +233,8 @@ SIMPLE_JWT = {
     "REFRESH_TOKEN_LIFETIME": timedelta(days=7),
     "ROTATE_REFRESH_TOKENS": True,
     "BLACKLIST_AFTER_ROTATION": False,
-    "UPDATE_LAST_LOGIN": True,
+    # last_login is written by EmailTokenObtainPairSerializer, at most once a minute per user
+    "UPDATE_LAST_LOGIN": False,
     "ALGORITHM": "HS256",
     "AUTH_HEADER_TYPES": ("Bearer",),
     "AUTH_HEADER_NAME": "HTTP_AUTHORIZATION",
@@ -267,7 +295,8 @@ CELERY_TIMEZONE = "Europe/Warsaw"
 CELERY_ENABLE_UTC = True
 
 # Task settings
-CELERY_TASK_TRACK_STARTED = True
+# Nothing reads task results, so don't write a result-backend key per run
+CELERY_TASK_IGNORE_RESULT = True
 CELERY_TASK_TIME_LIMIT = 30 * 60  # 30 minutes max per task
 CELERY_TASK_SOFT_TIME_LIMIT = 25 * 60  # Soft limit at 25 minutes
 
@@ -277,3 +306,18 @@ CELERY_TASK_SOFT_TIME_LIMIT = 25 * 60  # Soft limit at 25 minutes
 
 EXPO_PUSH_API_URL = "https://exp.host/--/api/v2/push/send"
 EXPO_PUSH_BATCH_SIZE = 100  # Max notifications per request
+
+# Pending notifications due within this window are queued with a Celery ETA when created.
+# Keep it below the Redis broker visibility timeout (1h) or ETA tasks get redelivered.
+NOTIFICATION_ETA_HORIZON = 50 * 60  # seconds
+
+# A notification claimed for sending (SENDING) longer than this is assumed to belong to a
+# worker that died mid-send and goes back to PENDING. No task outlives CELERY_TASK_TIME_LIMIT.
+NOTIFICATION_CLAIM_TIMEOUT = CELERY_TASK_TIME_LIMIT  # seconds
+
+# =============================================================================
+# LLM
+# =============================================================================
+
+# Configure the Gemini client when Django starts instead of on the first LLM request
+LLM_WARMUP = config("LLM_WARMUP", default=False, cast=bool)
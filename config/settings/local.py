@@ -29,9 +29,15 @@ DATABASES = {
         "PASSWORD": config("DB_PASSWORD", default=config("POSTGRES_PASSWORD", default="postgres")),
         "HOST": config("DB_HOST", default=config("POSTGRES_HOST", default="localhost")),
         "PORT": config("DB_PORT", default=config("POSTGRES_PORT", default="5432")),
+        "CONN_MAX_AGE": 600,
+        "CONN_HEALTH_CHECKS": True,
     }
 }
 
+# PBKDF2 iterations for new password hashes, to make seed_data faster; 0 keeps
+# Django's count. Never set in base settings, see apps/users/hashers.py
+PASSWORD_HASH_ITERATIONS = config("PASSWORD_HASH_ITERATIONS", default=0, cast=int)
+
 # Debug Toolbar
 INSTALLED_APPS += ["debug_toolbar", "django_extensions"]  # noqa: F405
 MIDDLEWARE += ["debug_toolbar.middleware.DebugToolbarMiddleware"]  # noqa: F405
@@ -48,6 +54,11 @@ REST_FRAMEWORK["DEFAULT_PERMISSION_CLASSES"] = [  # noqa: F405
 # Disable throttling in development
 REST_FRAMEWORK["DEFAULT_THROTTLE_CLASSES"] = []  # noqa: F405
 
+# Browsable API for development
+REST_FRAMEWORK["DEFAULT_RENDERER_CLASSES"] += [  # noqa: F405
+    "rest_framework.renderers.BrowsableAPIRenderer",
+]
+
 # DRF Spectacular - Enable schema endpoint
 SPECTACULAR_SETTINGS["SERVE_INCLUDE_SCHEMA"] = True  # noqa: F405
 
@@ -6,17 +6,21 @@ from decouple import config
 
 from .base import *  # noqa: F401, F403
 
+
+def _csv(value):
+    """Split a comma-separated env var into a list of non-empty, stripped items."""
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
 DEBUG = False
 
-ALLOWED_HOSTS = config(
-    "ALLOWED_HOSTS", default="", cast=lambda v: [s.strip() for s in v.split(",") if s.strip()]
-)
+ALLOWED_HOSTS = config("ALLOWED_HOSTS", default="", cast=_csv)
 
 # CSRF settings
 CSRF_TRUSTED_ORIGINS = config(
     "CSRF_TRUSTED_ORIGINS",
     default="https://api-sda.com,http://localhost:5174",
-    cast=lambda v: [s.strip() for s in v.split(",") if s.strip()],
+    cast=_csv,
 )
 
 # Database - PostgreSQL for production
@@ -28,9 +32,15 @@ DATABASES = {
         "PASSWORD": config("DB_PASSWORD"),
         "HOST": config("DB_HOST", default="localhost"),
         "PORT": config("DB_PORT", default="5432"),
-        "CONN_MAX_AGE": 60,
+        "CONN_MAX_AGE": config("DB_CONN_MAX_AGE", default=600, cast=int),
+        "CONN_HEALTH_CHECKS": True,
         "OPTIONS": {
             "connect_timeout": 10,
+            # Keep idle persistent connections from being dropped silently by NAT/firewalls
+            "keepalives": 1,
+            "keepalives_idle": 30,
+            "keepalives_interval": 10,
+            "keepalives_count": 3,
         },
     }
 }
@@ -48,23 +58,31 @@ CSRF_COOKIE_SECURE = True
 
 # Static files with whitenoise
 MIDDLEWARE.insert(1, "whitenoise.middleware.WhiteNoiseMiddleware")  # noqa: F405
-STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
+# STATICFILES_STORAGE was removed in Django 5.1; WhiteNoise also writes .br files when Brotli
+# is installed
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage"},
+}
 
-# Cache with Redis
-CACHES = {
-    "default": {
-        "BACKEND": "django_redis.cache.RedisCache",
-        "LOCATION": config("REDIS_URL", default="redis://127.0.0.1:6379/1"),
-        "OPTIONS": {
-            "CLIENT_CLASS": "django_redis.client.DefaultClient",
-        },
+# Bounded Redis connection pool per worker; a Redis outage degrades to cache misses
+CACHES["default"]["OPTIONS"].update(  # noqa: F405
+    {
+        "CONNECTION_POOL_KWARGS": {"max_connections": 50, "retry_on_timeout": True},
+        "SOCKET_CONNECT_TIMEOUT": 2,
+        "SOCKET_TIMEOUT": 2,
+        "IGNORE_EXCEPTIONS": True,
     }
-}
+)
 
-# Session with Redis
-SESSION_ENGINE = "django.contrib.sessions.backends.cache"
+# Sessions read from Redis, written through to the DB so a Redis outage doesn't log users out
+# (CACHES is configured in base)
+SESSION_ENGINE = "django.contrib.sessions.backends.cached_db"
 SESSION_CACHE_ALIAS = "default"
 
+# Warm the Gemini client in every gunicorn/Celery worker at startup
+LLM_WARMUP = config("LLM_WARMUP", default=True, cast=bool)
+
 # Public API URL for links in emails (e.g. verify-email)
 PUBLIC_API_BASE_URL = config("PUBLIC_API_BASE_URL", default="https://api-sda.com")
 
@@ -74,8 +92,8 @@ LOGGING = {
     "disable_existing_loggers": False,
     "formatters": {
         "verbose": {
-            "format": "{levelname} {asctime} {module} {process:d} {thread:d} {message}",
-            "style": "{",
+            "format": "%(levelname)s %(asctime)s %(module)s %(process)d %(thread)d %(message)s",
+            "style": "%",
         },
     },
     "handlers": {
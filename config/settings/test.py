@@ -0,0 +1,24 @@
+"""
+Test settings for SelfDevelopmentAppBackend project.
+
+Local settings, but with an in-process cache so the suite doesn't need Redis,
+cheap password hashing, and the production API permissions.
+"""
+
+from .local import *  # noqa: F401, F403
+
+# Each test process gets its own cache; code paths that need a Redis connection
+# fall back to plain cache operations (see core/llm/rate_limiter.py)
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    }
+}
+
+# Local settings allow anonymous API access; test against the base default
+REST_FRAMEWORK["DEFAULT_PERMISSION_CLASSES"] = [  # noqa: F405
+    "rest_framework.permissions.IsAuthenticated",
+]
+
+# Users are created in most tests; keep hashing their passwords cheap
+PASSWORD_HASH_ITERATIONS = 1000
@@ -0,0 +1,21 @@
+from django.apps import AppConfig
+from django.conf import settings
+
+
+class LLMConfig(AppConfig):
+    name = "core.llm"
+    label = "llm"
+    verbose_name = "LLM"
+
+    def ready(self):
+        # Pay the Gemini SDK import and model setup at worker boot, not on the first request
+        if not settings.LLM_WARMUP:
+            return
+
+        from .client import gemini_client
+        from .exceptions import LLMConfigurationError
+
+        try:
+            gemini_client._ensure_configured()
+        except LLMConfigurationError:
+            pass
@@ -4,19 +4,28 @@ Gemini LLM client wrapper.
 Provides a simple interface for interacting with Google's Gemini API.
 """
 
+import asyncio
+import hashlib
 import json
 import logging
+import math
+import random
 import re
-from typing import Any
+import threading
+import time
+from typing import Any, Generator, Iterator
 
-import google.generativeai as genai
-from google.api_core import exceptions as google_exceptions
+from django.core.cache import cache
+from pydantic import BaseModel, ValidationError
 
 from .config import (
     GEMINI_API_KEY,
     GEMINI_MODEL,
+    LLM_MAX_CONCURRENCY,
     LLM_MAX_OUTPUT_TOKENS,
+    LLM_MAX_RETRIES,
     LLM_REQUEST_TIMEOUT,
+    LLM_RESPONSE_CACHE_TTL,
     LLM_TEMPERATURE,
 )
 from .exceptions import (
@@ -26,10 +35,262 @@ from .exceptions import (
     LLMResponseError,
     RateLimitExceeded,
 )
-from .rate_limiter import check_rate_limit, increment_rate_limit
+from .rate_limiter import release_rate_limit, reserve_rate_limit
+
+try:
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError, so handlers below catch both
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
 
 logger = logging.getLogger(__name__)
 
+# JSON repair patterns, compiled once
+_TRAIL_COMMA_RE = re.compile(r",(\s*[}\]])")
+_INCOMPLETE_KV_RE = re.compile(r',?\s*"[^"]*":\s*"?[^"}\]]*$')
+_EMPTY_KV_RE = re.compile(r',?\s*"[^"]*":\s*$')
+_TRAIL_COMMA_EOL_RE = re.compile(r",(\s*)$")
+_JSON_VALUE_END_CHARS = frozenset('"}]0123456789elnsu')
+
+# GEMINI_API_KEY is read once at import; changing it requires a process restart
+_IS_CONFIGURED = bool(GEMINI_API_KEY)
+
+# Per-call override merged into the model's generation config: Gemini returns a
+# bare JSON body, so _extract_json only has to handle older/fenced responses
+_JSON_GENERATION_CONFIG = {"response_mime_type": "application/json"}
+
+# Backoff after a Gemini 429: 1s, 2s, 4s... plus jitter, and never waiting longer
+# than this inside a request (a longer server-requested delay fails fast instead)
+_RETRY_MAX_DELAY = 10
+
+# Log separators
+_SEP = "=" * 60
+_SUBSEP = "-" * 60
+
+
+def _response_cache_key(prompt: str, system_prompt: str | None) -> str:
+    """
+    Cache key for a generate_json() result.
+
+    Covers everything that shapes the output; whitespace is collapsed so
+    formatting-only differences in the prompt still hit.
+    """
+    normalized = "\x00".join(
+        (
+            GEMINI_MODEL,
+            str(LLM_TEMPERATURE),
+            str(LLM_MAX_OUTPUT_TOKENS),
+            " ".join((system_prompt or "").split()),
+            " ".join(prompt.split()),
+        )
+    )
+    return "llm:response:" + hashlib.sha256(normalized.encode()).hexdigest()
+
+
+def _validate(data: Any, schema: type[BaseModel] | None) -> Any:
+    """
+    Validate parsed LLM output against a pydantic schema, if one is given.
+
+    Raises:
+        LLMResponseError: If the data doesn't match the schema.
+    """
+    if schema is None:
+        return data
+    try:
+        return schema.model_validate(data)
+    except ValidationError as e:
+        logger.error("LLM response does not match %s: %s", schema.__name__, e)
+        raise LLMResponseError(
+            f"LLM response does not match {schema.__name__} ({e.error_count()} errors)"
+        )
+
+
+def _server_retry_delay(error: Exception) -> float | None:
+    """Retry delay Gemini sent with a 429 (RetryInfo detail), in seconds."""
+    for detail in getattr(error, "details", None) or ():
+        delay = getattr(detail, "retry_delay", None)
+        if delay is not None:
+            return delay.seconds + delay.nanos / 1e9
+    return None
+
+
+def _retry_backoff(error: Exception, attempt: int) -> float | None:
+    """Seconds to wait before retrying after a 429, or None to give up."""
+    if attempt >= LLM_MAX_RETRIES:
+        return None
+    delay = _server_retry_delay(error)
+    if delay is None:
+        delay = 2**attempt + random.uniform(0, 1)
+    return delay if delay <= _RETRY_MAX_DELAY else None
+
+
+def _find_fenced_block(text: str) -> str | None:
+    """
+    Return the body of the first markdown code block in text, or None.
+
+    A fence closes only on its own line and with at least the opener's backtick
+    count; fence lines carrying an info string (e.g. ```python) open a nested
+    block. Backticks inside JSON strings are never at line start, so they are
+    ignored. An unclosed block runs to the end of text (truncated response).
+    """
+    start = text.find("```")
+    if start == -1:
+        return None
+    fence_len = 3
+    while text.startswith("`", start + fence_len):
+        fence_len += 1
+
+    # Skip the info string ("json") and the newline after the opening fence
+    body_start = text.find("\n", start + fence_len)
+    if body_start == -1:
+        body_start = len(text)
+    info = text[start + fence_len : body_start].strip()
+    if info and not info.isalnum():
+        # Inline block: ```json {...}``` on a single line
+        end = text.find("`" * fence_len, start + fence_len)
+        if end == -1:
+            end = len(text)
+        return text[start + fence_len : end].strip().removeprefix("json").strip()
+    body_start += 1
+
+    depth = 1
+    pos = body_start
+    while pos < len(text):
+        line_end = text.find("\n", pos)
+        if line_end == -1:
+            line_end = len(text)
+        line = text[pos:line_end].strip()
+        if line.startswith("```"):
+            ticks = len(line) - len(line.lstrip("`"))
+            if line[ticks:].strip():
+                depth += 1
+            elif ticks >= fence_len or depth > 1:
+                depth -= 1
+                if depth == 0:
+                    return text[body_start:pos].strip()
+        pos = line_end + 1
+    return text[body_start:].strip()
+
+
+def _find_json_span(text: str) -> tuple[int, int] | None:
+    """
+    Locate the first balanced JSON object or array in text with a single scan.
+
+    Brackets inside string literals are ignored. Returns (start, end) slice
+    bounds, or None if the first opening bracket is never closed.
+    """
+    start = -1
+    depth = 0
+    in_string = escaped = False
+    for i, ch in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif start == -1:
+            if ch in "{[":
+                start = i
+                depth = 1
+        elif ch == '"':
+            in_string = True
+        elif ch in "{[":
+            depth += 1
+        elif ch in "}]":
+            depth -= 1
+            if depth == 0:
+                return start, i + 1
+    return None
+
+
+def _bracket_balance(text: str) -> tuple[int, int]:
+    """
+    Return (unclosed braces, unclosed brackets) in one pass over text.
+
+    Brackets inside string literals are ignored.
+    """
+    braces = brackets = 0
+    in_string = escaped = False
+    for ch in text:
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == "{":
+            braces += 1
+        elif ch == "}":
+            braces -= 1
+        elif ch == "[":
+            brackets += 1
+        elif ch == "]":
+            brackets -= 1
+    return braces, brackets
+
+
+class _ArrayItemScanner:
+    """
+    Incrementally pick complete items out of one array in a streamed JSON object.
+
+    Feed text chunks as they arrive; each call returns the object/array items of
+    the top-level ``key`` array that were completed by that chunk. Anything
+    before the first ``{`` (e.g. a markdown fence) is ignored.
+    """
+
+    def __init__(self, key: str):
+        self.key = key
+        self.text = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = self._escaped = False
+        self._string_start = None
+        self._last_key = None
+        self._in_array = False
+        self._item_start = None
+
+    def feed(self, chunk: str) -> list[Any]:
+        self.text += chunk
+        text = self.text
+        items = []
+        for i in range(self._pos, len(text)):
+            ch = text[i]
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif ch == "\\":
+                    self._escaped = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._string_start is not None:
+                        self._last_key = text[self._string_start + 1 : i]
+            elif ch == '"':
+                self._in_string = True
+                self._string_start = i if self._depth == 1 else None
+            elif ch in "{[":
+                self._depth += 1
+                if self._depth == 2 and ch == "[" and self._last_key == self.key:
+                    self._in_array = True
+                elif self._in_array and self._depth == 3:
+                    self._item_start = i
+            elif ch in "}]":
+                if self._in_array and self._depth == 3 and self._item_start is not None:
+                    try:
+                        items.append(json_loads(text[self._item_start : i + 1]))
+                    except json.JSONDecodeError:
+                        logger.debug("Skipping unparseable streamed %s item", self.key)
+                    self._item_start = None
+                elif self._in_array and self._depth == 2:
+                    self._in_array = False
+                self._depth -= 1
+        self._pos = len(text)
+        return items
+
 
 class GeminiClient:
     """
@@ -41,7 +302,11 @@ class GeminiClient:
 
     def __init__(self):
         self._model = None
+        self._system_models = {}
         self._configured = False
+        self._configure_lock = threading.Lock()
+        self._semaphore = None
+        self._semaphore_loop = None
 
     def _ensure_configured(self) -> None:
         """Ensure the client is configured with API key."""
@@ -53,22 +318,191 @@ class GeminiClient:
                 "GEMINI_API_KEY is not set. Please add it to your .env file."
             )
 
-        genai.configure(api_key=GEMINI_API_KEY)
-        self._model = genai.GenerativeModel(
+        with self._configure_lock:
+            # Another thread may have finished configuring while we waited
+            if self._configured:
+                return
+
+            # Imported on first use so processes that never call the LLM skip the SDK import
+            import google.generativeai as genai
+
+            # genai keeps one client (and its gRPC channel) per process for every model
+            genai.configure(api_key=GEMINI_API_KEY)
+            self._model = self._build_model()
+            self._configured = True
+        logger.info("Gemini client configured with model: %s", GEMINI_MODEL)
+
+    @staticmethod
+    def _build_model(system_instruction: str | None = None):
+        import google.generativeai as genai
+
+        return genai.GenerativeModel(
             model_name=GEMINI_MODEL,
             generation_config=genai.GenerationConfig(
                 max_output_tokens=LLM_MAX_OUTPUT_TOKENS,
                 temperature=LLM_TEMPERATURE,
             ),
+            system_instruction=system_instruction,
         )
-        self._configured = True
-        logger.info(f"Gemini client configured with model: {GEMINI_MODEL}")
+
+    def _get_model(self, system_prompt: str | None):
+        """
+        Model to use for a call, with system_prompt as its system instruction.
+
+        One model is kept per distinct system prompt; callers pass module-level
+        prompt constants, so this stays small.
+        """
+        if not system_prompt:
+            return self._model
+        model = self._system_models.get(system_prompt)
+        if model is None:
+            model = self._system_models[system_prompt] = self._build_model(system_prompt)
+        return model
+
+    def _log_request(self, prompt: str, system_prompt: str | None, input_tokens: int) -> None:
+        """Log the prompt being sent (skips building the strings when INFO is off)."""
+        if not logger.isEnabledFor(logging.INFO):
+            return
+        logger.info(_SEP)
+        logger.info("LLM REQUEST")
+        logger.info(_SEP)
+        logger.info("📥 INPUT TOKENS (est.): %d", input_tokens)
+        logger.info("⚙️  MAX OUTPUT TOKENS: %d", LLM_MAX_OUTPUT_TOKENS)
+        if system_prompt:
+            logger.info(
+                "System Prompt:\n%.500s%s",
+                system_prompt,
+                "..." if len(system_prompt) > 500 else "",
+            )
+        logger.info("User Prompt:\n%.1000s%s", prompt, "..." if len(prompt) > 1000 else "")
+        logger.info(_SUBSEP)
+
+    def _response_text(self, response, input_tokens: int) -> str:
+        """
+        Extract and log the text of a Gemini response.
+
+        Raises:
+            LLMResponseError: If the response is empty.
+        """
+        # Extract token usage from response
+        output_tokens = 0
+        total_tokens = 0
+        if hasattr(response, "usage_metadata") and response.usage_metadata:
+            input_tokens = getattr(response.usage_metadata, "prompt_token_count", input_tokens)
+            output_tokens = getattr(response.usage_metadata, "candidates_token_count", 0)
+            total_tokens = getattr(response.usage_metadata, "total_token_count", 0)
+
+        if not response.text:
+            logger.warning("LLM returned empty response")
+            raise LLMResponseError("Empty response from LLM")
+
+        response_text = response.text.strip()
+
+        # Log the response with token counts
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("LLM RESPONSE")
+            logger.info(_SEP)
+            logger.info("📥 INPUT TOKENS: %d", input_tokens)
+            logger.info("📤 OUTPUT TOKENS: %d", output_tokens)
+            logger.info("📊 TOTAL TOKENS: %d", total_tokens)
+            logger.info("📝 RESPONSE LENGTH: %d chars", len(response_text))
+            logger.info(_SUBSEP)
+            logger.info(
+                "Response:\n%.2000s%s",
+                response_text,
+                "..." if len(response_text) > 2000 else "",
+            )
+            logger.info(_SEP)
+
+        return response_text
+
+    @staticmethod
+    def _translate_error(e: Exception) -> LLMError:
+        """Log a failed generation and map it onto the LLM exception hierarchy."""
+        from google.api_core import exceptions as google_exceptions
+
+        if isinstance(e, google_exceptions.ResourceExhausted):
+            logger.warning("Gemini API rate limit hit: %s", e)
+            retry_after = _server_retry_delay(e)
+            error = RateLimitExceeded(
+                "Gemini API rate limit exceeded. Please try again later.",
+                retry_after=math.ceil(retry_after) if retry_after else None,
+            )
+        elif isinstance(e, google_exceptions.InvalidArgument):
+            logger.error("Invalid argument to Gemini API: %s", e)
+            error = LLMError(f"Invalid request: {e}")
+        elif isinstance(e, google_exceptions.GoogleAPIError):
+            logger.error("Gemini API error: %s", e)
+            error = LLMConnectionError(f"Failed to connect to Gemini API: {e}")
+        else:
+            logger.exception("Unexpected error during LLM generation: %s", e)
+            error = LLMError(f"Unexpected error: {e}")
+        logger.info(_SEP)
+        return error
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """
+        Semaphore capping in-flight async requests on the running event loop.
+
+        Created lazily, and again if the loop changes (e.g. one asyncio.run() per
+        Celery task), since a semaphore can't be shared across loops.
+        """
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    @staticmethod
+    def _with_retries(call):
+        """Run a Gemini call, retrying with backoff while it returns 429."""
+        from google.api_core import exceptions as google_exceptions
+
+        attempt = 0
+        while True:
+            try:
+                return call()
+            except google_exceptions.ResourceExhausted as e:
+                delay = _retry_backoff(e, attempt)
+                if delay is None:
+                    raise
+                attempt += 1
+                logger.warning(
+                    "Gemini API rate limit hit, retry %d/%d in %.1fs",
+                    attempt,
+                    LLM_MAX_RETRIES,
+                    delay,
+                )
+                time.sleep(delay)
+
+    @staticmethod
+    async def _awith_retries(call):
+        """Async version of _with_retries(); call returns an awaitable."""
+        from google.api_core import exceptions as google_exceptions
+
+        attempt = 0
+        while True:
+            try:
+                return await call()
+            except google_exceptions.ResourceExhausted as e:
+                delay = _retry_backoff(e, attempt)
+                if delay is None:
+                    raise
+                attempt += 1
+                logger.warning(
+                    "Gemini API rate limit hit, retry %d/%d in %.1fs",
+                    attempt,
+                    LLM_MAX_RETRIES,
+                    delay,
+                )
+                await asyncio.sleep(delay)
 
     def generate(
         self,
         prompt: str,
         user_id: int | None = None,
         system_prompt: str | None = None,
+        json_mode: bool = False,
     ) -> str:
         """
         Generate a text response from the LLM.
@@ -76,7 +510,8 @@ class GeminiClient:
         Args:
             prompt: The user prompt to send to the LLM.
             user_id: Optional user ID for rate limiting.
-            system_prompt: Optional system prompt to prepend.
+            system_prompt: Optional system prompt, sent as the system instruction.
+            json_mode: Ask Gemini for a bare JSON body (response_mime_type).
 
         Returns:
             Generated text response.
@@ -89,143 +524,261 @@ class GeminiClient:
         """
         self._ensure_configured()
 
-        # Check rate limit if user_id provided
-        if user_id:
-            check_rate_limit(user_id)
+        # Count the request against the user's limits up front; released again on failure
+        reservation = reserve_rate_limit(user_id) if user_id else None
 
         try:
-            # Prepare the full prompt
-            full_prompt = prompt
-            if system_prompt:
-                full_prompt = f"{system_prompt}\n\n---\n\n{prompt}"
+            # System prompt goes in as the model's system_instruction, not concatenated
+            model = self._get_model(system_prompt)
 
-            # Count input tokens
+            # Rough estimate for the request log; the exact count comes back in usage_metadata
+            input_tokens = (len(system_prompt or "") + len(prompt)) // 4
+            self._log_request(prompt, system_prompt, input_tokens)
+
+            # Generate response
             try:
-                token_count = self._model.count_tokens(full_prompt)
-                input_tokens = token_count.total_tokens
-            except Exception:
-                input_tokens = len(full_prompt) // 4  # Rough estimate
-
-            # Log the prompt being sent
-            logger.info("=" * 60)
-            logger.info("LLM REQUEST")
-            logger.info("=" * 60)
-            logger.info(f"📥 INPUT TOKENS: {input_tokens}")
-            logger.info(f"⚙️  MAX OUTPUT TOKENS: {LLM_MAX_OUTPUT_TOKENS}")
-            if system_prompt:
-                logger.info(
-                    f"System Prompt:\n{system_prompt[:500]}{'...' if len(system_prompt) > 500 else ''}"
+                response = self._with_retries(
+                    lambda: model.generate_content(
+                        prompt,
+                        generation_config=_JSON_GENERATION_CONFIG if json_mode else None,
+                        request_options={"timeout": LLM_REQUEST_TIMEOUT},
+                    )
                 )
-            logger.info(f"User Prompt:\n{prompt[:1000]}{'...' if len(prompt) > 1000 else ''}")
-            logger.info("-" * 60)
+            except Exception:
+                # Only successful calls count against the user's limits
+                if reservation:
+                    release_rate_limit(reservation)
+                raise
 
-            # Generate response
-            response = self._model.generate_content(
-                full_prompt,
-                request_options={"timeout": LLM_REQUEST_TIMEOUT},
-            )
+            return self._response_text(response, input_tokens)
+        except Exception as e:
+            raise self._translate_error(e)
+
+    async def agenerate(
+        self,
+        prompt: str,
+        user_id: int | None = None,
+        system_prompt: str | None = None,
+        json_mode: bool = False,
+    ) -> str:
+        """
+        Async version of generate().
+
+        At most LLM_MAX_CONCURRENCY requests are in flight per event loop, so
+        callers can gather() many prompts without flooding the API.
+        """
+        self._ensure_configured()
+
+        # The rate limiter talks to Redis synchronously, keep it off the event loop
+        reservation = await asyncio.to_thread(reserve_rate_limit, user_id) if user_id else None
+
+        try:
+            model = self._get_model(system_prompt)
+            input_tokens = (len(system_prompt or "") + len(prompt)) // 4
+            self._log_request(prompt, system_prompt, input_tokens)
+
+            try:
+                async with self._get_semaphore():
+                    response = await self._awith_retries(
+                        lambda: model.generate_content_async(
+                            prompt,
+                            generation_config=_JSON_GENERATION_CONFIG if json_mode else None,
+                            request_options={"timeout": LLM_REQUEST_TIMEOUT},
+                        )
+                    )
+            except Exception:
+                if reservation:
+                    await asyncio.to_thread(release_rate_limit, reservation)
+                raise
+
+            return self._response_text(response, input_tokens)
+        except Exception as e:
+            raise self._translate_error(e)
+
+    def generate_stream(
+        self,
+        prompt: str,
+        user_id: int | None = None,
+        system_prompt: str | None = None,
+        json_mode: bool = False,
+    ) -> Iterator[str]:
+        """
+        Generate a text response from the LLM, yielding chunks as they arrive.
+
+        Same arguments and exceptions as generate(); errors surface while iterating.
+        """
+        self._ensure_configured()
 
-            # Increment rate limit counter on success
-            if user_id:
-                increment_rate_limit(user_id)
-
-            # Extract token usage from response
-            output_tokens = 0
-            total_tokens = 0
-            if hasattr(response, "usage_metadata") and response.usage_metadata:
-                output_tokens = getattr(response.usage_metadata, "candidates_token_count", 0)
-                total_tokens = getattr(response.usage_metadata, "total_token_count", 0)
-
-            # Extract text from response
-            if response.text:
-                response_text = response.text.strip()
-
-                # Log the response with token counts
-                logger.info("LLM RESPONSE")
-                logger.info("=" * 60)
-                logger.info(f"📥 INPUT TOKENS: {input_tokens}")
-                logger.info(f"📤 OUTPUT TOKENS: {output_tokens}")
-                logger.info(f"📊 TOTAL TOKENS: {total_tokens}")
-                logger.info(f"📝 RESPONSE LENGTH: {len(response_text)} chars")
-                logger.info("-" * 60)
-                logger.info(
-                    f"Response:\n{response_text[:2000]}{'...' if len(response_text) > 2000 else ''}"
+        reservation = reserve_rate_limit(user_id) if user_id else None
+
+        try:
+            model = self._get_model(system_prompt)
+            input_tokens = (len(system_prompt or "") + len(prompt)) // 4
+            self._log_request(prompt, system_prompt, input_tokens)
+
+            try:
+                # The SDK fetches the first chunk here, so a 429 surfaces (and is retried) now
+                response = self._with_retries(
+                    lambda: model.generate_content(
+                        prompt,
+                        generation_config=_JSON_GENERATION_CONFIG if json_mode else None,
+                        stream=True,
+                        request_options={"timeout": LLM_REQUEST_TIMEOUT},
+                    )
                 )
-                logger.info("=" * 60)
-
-                return response_text
-            else:
-                logger.warning("LLM returned empty response")
-                raise LLMResponseError("Empty response from LLM")
-
-        except google_exceptions.ResourceExhausted as e:
-            logger.warning(f"Gemini API rate limit hit: {e}")
-            logger.info("=" * 60)
-            raise RateLimitExceeded("Gemini API rate limit exceeded. Please try again later.")
-        except google_exceptions.InvalidArgument as e:
-            logger.error(f"Invalid argument to Gemini API: {e}")
-            logger.info("=" * 60)
-            raise LLMError(f"Invalid request: {e}")
-        except google_exceptions.GoogleAPIError as e:
-            logger.error(f"Gemini API error: {e}")
-            logger.info("=" * 60)
-            raise LLMConnectionError(f"Failed to connect to Gemini API: {e}")
+                for chunk in response:
+                    # The final chunk may carry only the finish reason and no text
+                    if chunk.parts:
+                        yield chunk.text
+            except Exception:
+                if reservation:
+                    release_rate_limit(reservation)
+                raise
+
+            # The streamed response accumulates the full text and usage for logging
+            self._response_text(response, input_tokens)
         except Exception as e:
-            logger.exception(f"Unexpected error during LLM generation: {e}")
-            logger.info("=" * 60)
-            raise LLMError(f"Unexpected error: {e}")
+            raise self._translate_error(e)
 
     def generate_json(
         self,
         prompt: str,
         user_id: int | None = None,
         system_prompt: str | None = None,
-    ) -> dict[str, Any]:
+        schema: type[BaseModel] | None = None,
+        cache_ttl: int | None = None,
+    ) -> Any:
         """
         Generate a JSON response from the LLM.
 
-        The prompt should instruct the LLM to respond with valid JSON.
+        The prompt should instruct the LLM to respond with valid JSON. Results are
+        cached for cache_ttl seconds (LLM_RESPONSE_CACHE_TTL by default; 0 disables
+        caching), and a cache hit is not counted against the user's rate limit.
 
         Args:
             prompt: The user prompt (should request JSON output).
             user_id: Optional user ID for rate limiting.
-            system_prompt: Optional system prompt to prepend.
+            system_prompt: Optional system prompt, sent as the system instruction.
+            schema: Optional pydantic model to validate the response against.
+            cache_ttl: Response cache lifetime in seconds; pass 0 for prompts whose
+                answer should never be reused.
 
         Returns:
-            Parsed JSON response as a dictionary.
+            Parsed JSON response as a dictionary, or a schema instance if given.
 
         Raises:
-            LLMResponseError: If response is not valid JSON.
+            LLMResponseError: If response is not valid JSON or doesn't match schema.
+            (Plus all exceptions from generate())
+        """
+        ttl = LLM_RESPONSE_CACHE_TTL if cache_ttl is None else cache_ttl
+        cache_key = _response_cache_key(prompt, system_prompt) if ttl else None
+        if cache_key:
+            cached = cache.get(cache_key)
+            if cached is not None:
+                logger.info("LLM response cache hit")
+                return _validate(cached, schema)
+
+        response = self.generate(prompt, user_id, system_prompt, json_mode=True)
+        parsed, repaired = self._parse_json(response)
+        result = _validate(parsed, schema)
+
+        # Only cache output that validated and wasn't patched up by _repair_json
+        if cache_key and not repaired:
+            cache.set(cache_key, parsed, timeout=ttl)
+        return result
+
+    async def agenerate_json(
+        self,
+        prompt: str,
+        user_id: int | None = None,
+        system_prompt: str | None = None,
+        schema: type[BaseModel] | None = None,
+        cache_ttl: int | None = None,
+    ) -> Any:
+        """Async version of generate_json()."""
+        ttl = LLM_RESPONSE_CACHE_TTL if cache_ttl is None else cache_ttl
+        cache_key = _response_cache_key(prompt, system_prompt) if ttl else None
+        if cache_key:
+            cached = await cache.aget(cache_key)
+            if cached is not None:
+                logger.info("LLM response cache hit")
+                return _validate(cached, schema)
+
+        response = await self.agenerate(prompt, user_id, system_prompt, json_mode=True)
+        parsed, repaired = self._parse_json(response)
+        result = _validate(parsed, schema)
+
+        # Only cache output that validated and wasn't patched up by _repair_json
+        if cache_key and not repaired:
+            await cache.aset(cache_key, parsed, timeout=ttl)
+        return result
+
+    def generate_json_stream(
+        self,
+        prompt: str,
+        user_id: int | None = None,
+        system_prompt: str | None = None,
+        array_key: str = "milestones",
+        schema: type[BaseModel] | None = None,
+        item_schema: type[BaseModel] | None = None,
+    ) -> Generator[Any, None, Any]:
+        """
+        Generate a JSON response, yielding items of one array as they are generated.
+
+        Each complete object in the top-level ``array_key`` array is yielded as
+        soon as its closing bracket arrives, validated against item_schema if
+        given. The generator's return value (the StopIteration value) is the
+        full parsed response, as from generate_json() with schema.
+
+        Raises:
+            LLMResponseError: If the response is not valid JSON or doesn't match a schema.
             (Plus all exceptions from generate())
         """
-        response = self.generate(prompt, user_id, system_prompt)
+        scanner = _ArrayItemScanner(array_key)
+        for chunk in self.generate_stream(prompt, user_id, system_prompt, json_mode=True):
+            for item in scanner.feed(chunk):
+                yield _validate(item, item_schema)
+        parsed, _ = self._parse_json(scanner.text.strip())
+        return _validate(parsed, schema)
+
+    def _parse_json(self, response: str) -> tuple[Any, bool]:
+        """
+        Parse a raw LLM response as JSON, repairing it if needed.
+
+        Returns:
+            The parsed JSON and whether it had to be repaired.
 
+        Raises:
+            LLMResponseError: If response is not valid JSON.
+        """
         # Try to extract JSON from response (handles markdown code blocks)
         json_str = self._extract_json(response)
 
         try:
-            parsed = json.loads(json_str)
+            parsed = json_loads(json_str)
             logger.debug(
-                f"Successfully parsed JSON response with keys: {list(parsed.keys()) if isinstance(parsed, dict) else 'array'}"
+                "Successfully parsed JSON response with keys: %s",
+                list(parsed) if isinstance(parsed, dict) else "array",
             )
-            return parsed
+            return parsed, False
         except json.JSONDecodeError as e:
-            logger.warning(f"Initial JSON parse failed: {e}")
+            logger.warning("Initial JSON parse failed: %s", e)
             logger.warning("Attempting to repair JSON...")
 
             # Try to repair truncated JSON
             repaired = self._repair_json(json_str)
             try:
-                parsed = json.loads(repaired)
+                parsed = json_loads(repaired)
                 logger.info("✅ JSON repaired successfully!")
-                return parsed
+                return parsed, True
             except json.JSONDecodeError as e2:
-                logger.error(f"Failed to parse LLM response as JSON: {e2}")
-                logger.error(f"Raw response length: {len(response)} chars")
-                logger.error(f"Last 500 chars of response:\n{response[-500:]}")
+                logger.error("Failed to parse LLM response as JSON: %s", e2)
+                logger.error("Raw response length: %d chars", len(response))
+                logger.error("Last 500 chars of response:\n%s", response[-500:])
                 raise LLMResponseError(f"LLM response is not valid JSON: {e}")
 
-    def _extract_json(self, text: str) -> str:
+    @staticmethod
+    def _extract_json(text: str) -> str:
         """
         Extract JSON from text, handling markdown code blocks.
 
@@ -235,20 +788,34 @@ class GeminiClient:
         Returns:
             Extracted JSON string.
         """
+        # Fast path: a bare JSON body (the norm with JSON mode) needs no scanning
+        stripped = text.strip()
+        if stripped[:1] in ("{", "[") and stripped[-1:] in ("}", "]"):
+            return stripped
+
         # Try to find JSON in markdown code block
-        json_match = re.search(r"```(?:json)?\s*\n?([\s\S]*?)\n?```", text)
-        if json_match:
-            return json_match.group(1).strip()
+        block = _find_fenced_block(text)
+        if block is not None:
+            return block
 
         # Try to find raw JSON object or array
-        json_match = re.search(r"(\{[\s\S]*\}|\[[\s\S]*\])", text)
-        if json_match:
-            return json_match.group(1).strip()
+        span = _find_json_span(text)
+        if span:
+            return text[span[0] : span[1]]
+
+        # Truncated JSON: first opener up to the last matching closer, for _repair_json
+        last_brace, last_bracket = text.rfind("}"), text.rfind("]")
+        for i, ch in enumerate(text):
+            if ch == "{" and i < last_brace:
+                return text[i : last_brace + 1]
+            if ch == "[" and i < last_bracket:
+                return text[i : last_bracket + 1]
 
         # Return as-is and let JSON parser handle it
         return text.strip()
 
-    def _repair_json(self, json_str: str) -> str:
+    @staticmethod
+    def _repair_json(json_str: str) -> str:
         """
         Attempt to repair truncated or malformed JSON.
 
@@ -261,41 +828,41 @@ class GeminiClient:
 
         # Remove trailing incomplete elements
         # Find last complete element (ends with }, ], ", number, true, false, null)
-        while repaired and repaired[-1] not in '"}]0123456789elnsu':
-            repaired = repaired[:-1].strip()
+        end = len(repaired)
+        while end and repaired[end - 1] not in _JSON_VALUE_END_CHARS:
+            end -= 1
+        repaired = repaired[:end]
 
         # Remove trailing commas
-        repaired = re.sub(r",(\s*[}\]])", r"\1", repaired)
+        repaired = _TRAIL_COMMA_RE.sub(r"\1", repaired)
 
         # Count brackets to see what's missing
-        open_braces = repaired.count("{") - repaired.count("}")
-        open_brackets = repaired.count("[") - repaired.count("]")
+        open_braces, open_brackets = _bracket_balance(repaired)
 
         # If we have unclosed structures, try to close them
         if open_braces > 0 or open_brackets > 0:
             # Remove any trailing incomplete key-value pair
             # e.g., '"key": ' or '"key": "incomplete
-            repaired = re.sub(r',?\s*"[^"]*":\s*"?[^"}\]]*$', "", repaired)
-            repaired = re.sub(r',?\s*"[^"]*":\s*$', "", repaired)
+            repaired = _INCOMPLETE_KV_RE.sub("", repaired)
+            repaired = _EMPTY_KV_RE.sub("", repaired)
 
             # Remove trailing comma again
-            repaired = re.sub(r",(\s*)$", r"\1", repaired)
+            repaired = _TRAIL_COMMA_EOL_RE.sub(r"\1", repaired)
 
             # Recount after cleanup
-            open_braces = repaired.count("{") - repaired.count("}")
-            open_brackets = repaired.count("[") - repaired.count("]")
+            open_braces, open_brackets = _bracket_balance(repaired)
 
             # Close arrays first, then objects
             repaired += "]" * open_brackets
             repaired += "}" * open_braces
 
-        logger.debug(f"JSON repair: added {open_brackets} ] and {open_braces} }}")
+        logger.debug("JSON repair: added %d ] and %d }", open_brackets, open_braces)
 
         return repaired
 
     def is_configured(self) -> bool:
         """Check if the client is properly configured."""
-        return bool(GEMINI_API_KEY)
+        return _IS_CONFIGURED
 
 
 # Singleton instance for convenience
@@ -11,10 +11,22 @@ GEMINI_MODEL = config("GEMINI_MODEL", default="gemini-2.5-flash")
 # Rate limiting settings (per user)
 LLM_RATE_LIMIT_REQUESTS_PER_DAY = config("LLM_RATE_LIMIT_REQUESTS_PER_DAY", default=50, cast=int)
 LLM_RATE_LIMIT_REQUESTS_PER_HOUR = config("LLM_RATE_LIMIT_REQUESTS_PER_HOUR", default=10, cast=int)
+# "token_bucket" (allows short bursts), "sliding_window" (strict cap over any period)
+# or "sliding_log" (exact cap, one sorted-set entry per request)
+LLM_RATE_LIMIT_ALGORITHM = config("LLM_RATE_LIMIT_ALGORITHM", default="token_bucket")
 
 # Generation settings
 LLM_MAX_OUTPUT_TOKENS = config("LLM_MAX_OUTPUT_TOKENS", default=32768, cast=int)
 LLM_TEMPERATURE = config("LLM_TEMPERATURE", default=0.7, cast=float)
 
+# Seconds to reuse generate_json() results for an identical prompt (0 disables)
+LLM_RESPONSE_CACHE_TTL = config("LLM_RESPONSE_CACHE_TTL", default=86400, cast=int)
+
 # Timeout settings (in seconds)
 LLM_REQUEST_TIMEOUT = config("LLM_REQUEST_TIMEOUT", default=180, cast=int)
+
+# Retries after a Gemini 429 (ResourceExhausted), with exponential backoff
+LLM_MAX_RETRIES = config("LLM_MAX_RETRIES", default=2, cast=int)
+
+# Max in-flight requests per event loop for the async client methods
+LLM_MAX_CONCURRENCY = config("LLM_MAX_CONCURRENCY", default=8, cast=int)
@@ -4,6 +4,10 @@ Prompt templates for LLM interactions.
 All prompts should be defined here for easy management and versioning.
 """
 
+import functools
+import re
+from string import Formatter
+
 # =============================================================================
 # SYSTEM PROMPTS
 # =============================================================================
@@ -29,7 +33,11 @@ Key principles:
 4. COMPLETE: From preparation to final achievement
 5. ACTIONABLE: Every task should be something the user can do TODAY
 
-Always respond in the same language the user uses."""
+Always:
+- Never skip periods or combine them
+- Be SPECIFIC about what to learn in each milestone
+- Include the EXACT resources/apps to use
+- Respond in the same language the user uses"""
 
 
 QUESTION_GENERATOR_SYSTEM = """You are a helpful assistant that asks clarifying questions.
@@ -95,43 +103,13 @@ Do NOT ask generic questions. Tailor each question to this specific goal."""
 # PLAN GENERATION (Step 2: Generate plan based on answers)
 # =============================================================================
 
-GOAL_PLAN_TEMPLATE = """Based on the following information, create a detailed, granular plan to achieve this goal.
-
-## Goal
-{goal_title}
-{goal_description}
-
-## User's Answers to Clarifying Questions
-{answers}
-
-## Timeline
-Today's Date: {today_date}
-Target Date: {target_date}
-
-## CRITICAL: Plan Size Requirements
-
-**YOU MUST CREATE EXACTLY {num_milestones} MILESTONES with EXACTLY {tasks_per_milestone} TASKS EACH.**
-
-This is a strict requirement. Do not create more or fewer milestones/tasks.
-
-## Milestone Structure
-
-Distribute the milestones evenly across the timeline from {today_date} to {target_date}:
-- First milestone: Foundation & Setup
-- Middle milestones: Progressive skill building
-- Final milestone: Achievement & completion
-
-Each milestone should have a clear, specific focus and measurable outcomes.
-
-## Task Requirements
-
-Each milestone should have exactly {tasks_per_milestone} tasks that are:
-- Specific and actionable
-- Completable in 30 minutes to 2 hours
-- A mix of learning, practice, and assessment
-- Properly prioritized (high/medium/low)
-
-Tasks should be completable in 30 minutes to 2 hours maximum.
+# Static instructions come first and the per-user fields last, so the system
+# instruction plus everything up to "## Goal" is a byte-identical prefix that
+# Gemini's implicit context caching can reuse across users. The plan size is
+# rendered inline, so the prefix is shared by every plan of the same size (the
+# 5x3 default for nearly all of them); the few-shot {example} also goes ahead of
+# the per-user fields.
+GOAL_PLAN_TEMPLATE = """Create a detailed, granular plan to achieve the goal described below.
 
 ## Response Format
 
@@ -165,7 +143,44 @@ Respond ONLY with valid JSON:
     "final_achievement": "Concrete success definition"
 }}
 
-## Example: Learning German to B2 (6 months)
+## CRITICAL: Plan Size Requirements
+
+**YOU MUST CREATE EXACTLY {num_milestones} MILESTONES with EXACTLY {tasks_per_milestone} TASKS EACH.**
+
+This is a strict requirement. Do not create more or fewer milestones/tasks.
+
+## Milestone Structure
+
+Distribute the milestones evenly across the timeline from today's date to the target date:
+- First milestone: Foundation & Setup
+- Middle milestones: Progressive skill building
+- Final milestone: Achievement & completion
+
+Each milestone should have a clear, specific focus and measurable outcomes.
+
+## Task Requirements
+
+Each milestone should have exactly {tasks_per_milestone} tasks that are:
+- Specific and actionable
+- Completable in 30 minutes to 2 hours
+- A mix of learning, practice, and assessment
+- Properly prioritized (high/medium/low)
+
+{example}## Goal
+{goal_title}
+{goal_description}
+
+## User's Answers to Clarifying Questions
+{answers}
+
+## Timeline
+Today's Date: {today_date}
+Target Date: {target_date}"""
+
+# Few-shot examples added to the plan prompt only for goals that match them
+# (see format_goal_plan_prompt)
+GOAL_PLAN_EXAMPLES = {
+    "language": """## Example: Learning German to B2 (6 months)
 
 Week 1: Setup & Fundamentals
 - Task: Download Duolingo + Anki
@@ -187,21 +202,50 @@ Week 3: Basic Grammar
 - Task: Practice 20 basic sentences
 - Task: First conversation with tutor
 
-... and so on for ALL 24 weeks!
-
-REMEMBER:
-- NEVER skip weeks or combine them
-- Each week = 7 days maximum
-- Be SPECIFIC about what to learn each week
-- Include the EXACT resources/apps to use"""
-
-
-MOTIVATIONAL_QUOTES_TEMPLATE = """Użytkownik ma następujące zadania.
-
-Zadania:
-{tasks_text}
-
-Wygeneruj do {quote_count} krótkich cytatów motywacyjnych wyłącznie na podstawie tytułu i opisu zadania.
+... and so on for ALL 24 weeks!""",
+}
+
+# Words in a goal's title/description that select each example
+GOAL_PLAN_EXAMPLE_KEYWORDS = {
+    "language": frozenset(
+        {
+            "language",
+            "languages",
+            "german",
+            "english",
+            "spanish",
+            "french",
+            "italian",
+            "polish",
+            "japanese",
+            "chinese",
+            "vocabulary",
+            "grammar",
+            "fluent",
+            "fluency",
+            "a1",
+            "a2",
+            "b1",
+            "b2",
+            "c1",
+            "c2",
+            "język",
+            "języka",
+            "niemiecki",
+            "niemieckiego",
+            "angielski",
+            "angielskiego",
+            "hiszpański",
+            "hiszpańskiego",
+            "francuski",
+            "francuskiego",
+        }
+    ),
+}
+
+
+# Static instructions first, user tasks last (see GOAL_PLAN_TEMPLATE)
+MOTIVATIONAL_QUOTES_TEMPLATE = """Tworzysz krótkie cytaty motywacyjne wyłącznie na podstawie tytułu i opisu zadań użytkownika.
 Każdy cytat ma nawiązywać do KORZYŚCI wynikających z wykonania danego zadania.
 Nie wymyślaj faktów, których nie ma w tytule/opisie.
 Jeśli w zadaniach nie ma istotnych szczegółów (tytuł i opis są zbyt ogólne), zwróć pustą listę.
@@ -217,7 +261,47 @@ Zwróć TYLKO poprawny JSON w tym formacie:
     ]
 }}
 
-Jeśli zwracasz pustą listę, użyj dokładnie: {{ "quotes": [] }}."""
+Jeśli zwracasz pustą listę, użyj dokładnie: {{ "quotes": [] }}.
+
+Zadania użytkownika:
+{tasks_text}
+
+Wygeneruj do {quote_count} cytatów."""
+
+
+# =============================================================================
+# COMPILED TEMPLATES
+# =============================================================================
+
+
+class PromptTemplate:
+    """
+    A str.format-style template, split into literal text and fields once.
+
+    format() then only joins strings, instead of re-parsing the template on
+    every call like str.format(). Only plain ``{name}`` fields are supported.
+    """
+
+    __slots__ = ("_parts",)
+
+    def __init__(self, template: str):
+        parts = []
+        for literal, field, spec, conversion in Formatter().parse(template):
+            if field == "" or spec or conversion:
+                raise ValueError(f"Unsupported template field: {{{field}}}")
+            parts.append((literal, field))
+        self._parts = tuple(parts)
+
+    def format(self, **values) -> str:
+        return "".join(
+            literal if field is None else literal + str(values[field])
+            for literal, field in self._parts
+        )
+
+
+GENERATE_QUESTIONS_PROMPT = PromptTemplate(GENERATE_QUESTIONS_TEMPLATE)
+GOAL_PLAN_PROMPT = PromptTemplate(GOAL_PLAN_TEMPLATE)
+MOTIVATIONAL_QUOTES_PROMPT = PromptTemplate(MOTIVATIONAL_QUOTES_TEMPLATE)
 
 
 # =============================================================================
@@ -225,6 +309,7 @@ Jeśli zwracasz pustą listę, użyj dokładnie: {{ "quotes": [] }}."""
 # =============================================================================
 
 
+@functools.lru_cache(maxsize=1024)
 def format_generate_questions_prompt(goal_description: str) -> str:
     """
     Format the prompt for generating contextual questions.
@@ -235,7 +320,7 @@ def format_generate_questions_prompt(goal_description: str) -> str:
     Returns:
         Formatted prompt string.
     """
-    return GENERATE_QUESTIONS_TEMPLATE.format(
+    return GENERATE_QUESTIONS_PROMPT.format(
         goal_description=goal_description,
     )
 
@@ -252,6 +337,9 @@ def format_goal_plan_prompt(
     """
     Format the goal planning prompt with user's data.
 
+    A few-shot example is inserted before the per-goal fields when the goal
+    matches one of GOAL_PLAN_EXAMPLE_KEYWORDS.
+
     Args:
         goal_title: The title of the goal.
         goal_description: Detailed description of the goal.
@@ -264,7 +352,9 @@ def format_goal_plan_prompt(
     Returns:
         Formatted prompt string.
     """
-    return GOAL_PLAN_TEMPLATE.format(
+    example = _pick_goal_plan_example(f"{goal_title} {goal_description or ''}")
+    return GOAL_PLAN_PROMPT.format(
+        example=f"{example}\n\n" if example else "",
         goal_title=goal_title,
         goal_description=goal_description or "No additional description provided.",
         answers=answers_text,
@@ -275,6 +365,16 @@ def format_goal_plan_prompt(
     )
 
 
+def _pick_goal_plan_example(goal_text: str) -> str | None:
+    """Return the few-shot example whose keywords appear in the goal text, if any."""
+    words = set(re.findall(r"\w+", goal_text.lower()))
+    for kind, keywords in GOAL_PLAN_EXAMPLE_KEYWORDS.items():
+        if not words.isdisjoint(keywords):
+            return GOAL_PLAN_EXAMPLES[kind]
+    return None
+
+
+@functools.lru_cache(maxsize=1024)
 def format_motivational_quotes_prompt(
     tasks_text: str,
     quote_count: int,
@@ -289,7 +389,7 @@ def format_motivational_quotes_prompt(
     Returns:
         Formatted prompt string.
     """
-    return MOTIVATIONAL_QUOTES_TEMPLATE.format(
+    return MOTIVATIONAL_QUOTES_PROMPT.format(
         tasks_text=tasks_text,
         quote_count=quote_count,
     )
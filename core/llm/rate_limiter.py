@@ -1,15 +1,45 @@
 """
 Rate limiting for LLM API calls.
 
-Uses Django's cache backend to track request counts per user.
+Each user has an hourly and a daily limit, kept in the cache backend. Three
+algorithms are available, picked with LLM_RATE_LIMIT_ALGORITHM:
+
+- token_bucket: a bucket holds up to the limit in tokens and refills
+  continuously at limit / period, so short bursts are allowed and a user is
+  never locked out for a whole window after one.
+- sliding_window: counts per fixed window, with the previous window weighted
+  by how much of it still overlaps the last period, so no period of that
+  length can exceed the limit by more than rounding.
+- sliding_log: keeps the timestamp of every counted request in one sorted
+  set per user, so each limit is exact over any period, at the cost of
+  storing up to the daily limit in entries per user.
+
+None lets a burst straddling a window boundary get twice the limit through.
 """
 
-from datetime import datetime, timedelta
+import logging
+import math
+import time
+import uuid
 
 from django.core.cache import cache
+from django_redis import get_redis_connection
+from redis.exceptions import RedisError
+
+from .config import (
+    LLM_RATE_LIMIT_ALGORITHM,
+    LLM_RATE_LIMIT_REQUESTS_PER_DAY,
+    LLM_RATE_LIMIT_REQUESTS_PER_HOUR,
+)
+from .exceptions import LLMConfigurationError, RateLimitExceeded
 
-from .config import LLM_RATE_LIMIT_REQUESTS_PER_DAY, LLM_RATE_LIMIT_REQUESTS_PER_HOUR
-from .exceptions import RateLimitExceeded
+logger = logging.getLogger(__name__)
+
+# (name, limit, period in seconds), checked in this order
+_LIMITS = (
+    ("hour", LLM_RATE_LIMIT_REQUESTS_PER_HOUR, 3600),
+    ("day", LLM_RATE_LIMIT_REQUESTS_PER_DAY, 86400),
+)
 
 
 def _get_cache_key(user_id: int, period: str) -> str:
@@ -17,81 +47,405 @@ def _get_cache_key(user_id: int, period: str) -> str:
     return f"llm_rate_limit:{user_id}:{period}"
 
 
-def _get_hourly_key(user_id: int) -> str:
-    """Get cache key for hourly rate limit."""
-    hour = datetime.now().strftime("%Y%m%d%H")
-    return _get_cache_key(user_id, f"hour:{hour}")
+_scripts = {}
 
 
-def _get_daily_key(user_id: int) -> str:
-    """Get cache key for daily rate limit."""
-    day = datetime.now().strftime("%Y%m%d")
-    return _get_cache_key(user_id, f"day:{day}")
+def _run_script(source: str, keys, args: list):
+    """Run a Lua script on the cache's Redis connection."""
+    client = get_redis_connection("default")
+    script = _scripts.get(source)
+    if script is None:
+        script = _scripts[source] = client.register_script(source)
+    return script(keys=[cache.make_key(key) for key in keys], args=args, client=client)
 
 
-def check_rate_limit(user_id: int) -> None:
-    """
-    Check if user has exceeded rate limits.
+# Token bucket
 
-    Args:
-        user_id: The ID of the user making the request.
+# Refill both buckets, then take a token from each only if both have one.
+# Returns {0, ""} on success, or {bucket index, its token level} on rejection.
+_TAKE_LUA = """
+local now = tonumber(ARGV[1])
+local levels = {}
+for i = 1, #KEYS do
+    local capacity = tonumber(ARGV[2 * i])
+    local rate = tonumber(ARGV[2 * i + 1])
+    local data = redis.call('HMGET', KEYS[i], 'tokens', 'ts')
+    local tokens = tonumber(data[1]) or capacity
+    local ts = tonumber(data[2]) or now
+    levels[i] = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+end
+for i = 1, #KEYS do
+    if levels[i] < 1 then return {i, tostring(levels[i])} end
+end
+for i = 1, #KEYS do
+    local ttl = math.ceil(tonumber(ARGV[2 * i]) / tonumber(ARGV[2 * i + 1]))
+    redis.call('HSET', KEYS[i], 'tokens', tostring(levels[i] - 1), 'ts', ARGV[1])
+    redis.call('EXPIRE', KEYS[i], ttl)
+end
+return {0, ''}
+"""
 
-    Raises:
-        RateLimitExceeded: If user has exceeded their rate limit.
+# Put a token back into each bucket, without exceeding its capacity.
+# ARGV is (capacity, rate) per bucket, as for _TAKE_LUA but without now.
+_GIVE_LUA = """
+for i = 1, #KEYS do
+    local tokens = tonumber(redis.call('HGET', KEYS[i], 'tokens'))
+    if tokens then
+        local capacity = tonumber(ARGV[2 * i - 1])
+        redis.call('HSET', KEYS[i], 'tokens', tostring(math.min(capacity, tokens + 1)))
+    end
+end
+return 0
+"""
+
+
+def _get_bucket_keys(user_id: int) -> tuple[str, ...]:
+    """Get cache keys for the user's hourly and daily buckets."""
+    return tuple(_get_cache_key(user_id, f"bucket:{name}") for name, _, _ in _LIMITS)
+
+
+def _bucket_args() -> list[float]:
+    """Capacity and refill rate (tokens/second) of each bucket, flattened."""
+    args = []
+    for _, capacity, period in _LIMITS:
+        args += [capacity, capacity / period]
+    return args
+
+
+def _refill(state: tuple[float, float] | None, capacity: int, rate: float, now: float) -> float:
+    """Token level of a bucket stored as (tokens, ts), refilled up to now."""
+    if state is None:
+        return capacity
+    tokens, ts = state
+    return min(capacity, tokens + max(0.0, now - ts) * rate)
+
+
+def _take_tokens(user_id: int, now: float) -> tuple[tuple[str, ...], int, int]:
     """
-    # Check hourly limit
-    hourly_key = _get_hourly_key(user_id)
-    hourly_count = cache.get(hourly_key, 0)
-
-    if hourly_count >= LLM_RATE_LIMIT_REQUESTS_PER_HOUR:
-        # Calculate seconds until next hour
-        now = datetime.now()
-        next_hour = (now + timedelta(hours=1)).replace(minute=0, second=0, microsecond=0)
-        retry_after = int((next_hour - now).total_seconds())
-        raise RateLimitExceeded(
-            f"Hourly rate limit exceeded ({LLM_RATE_LIMIT_REQUESTS_PER_HOUR} requests/hour)",
-            retry_after=retry_after,
+    Take one token from every bucket, or none if any bucket is empty.
+
+    Returns (keys to release, 1-based index of the empty bucket or 0, retry_after).
+    """
+    keys = _get_bucket_keys(user_id)
+    try:
+        rejected, level = _run_script(_TAKE_LUA, keys, [now] + _bucket_args())
+        rejected, level = int(rejected), float(level or 0)
+    except NotImplementedError:
+        # Non-Redis cache backend (e.g. LocMemCache in tests): same logic, not atomic
+        states = cache.get_many(keys)
+        levels = [
+            _refill(states.get(key), capacity, capacity / period, now)
+            for key, (_, capacity, period) in zip(keys, _LIMITS)
+        ]
+        rejected = next((i for i, level in enumerate(levels, start=1) if level < 1), 0)
+        if rejected:
+            level = levels[rejected - 1]
+        else:
+            for key, level, (_, _, period) in zip(keys, levels, _LIMITS):
+                cache.set(key, (level - 1, now), timeout=period)
+
+    if not rejected:
+        return keys, 0, 0
+    _, capacity, period = _LIMITS[rejected - 1]
+    # Seconds until the bucket has refilled to one whole token
+    return keys, rejected, math.ceil((1 - level) * period / capacity)
+
+
+def _give_tokens(keys: tuple[str, ...]) -> None:
+    """Return the tokens taken by _take_tokens()."""
+    try:
+        _run_script(_GIVE_LUA, keys, _bucket_args())
+        return
+    except NotImplementedError:
+        pass
+
+    states = cache.get_many(keys)
+    for key, (_, capacity, period) in zip(keys, _LIMITS):
+        if key in states:
+            tokens, ts = states[key]
+            cache.set(key, (min(capacity, tokens + 1), ts), timeout=period)
+
+
+def _remaining_tokens(user_id: int, now: float) -> list[int]:
+    """Requests each bucket would allow right now."""
+    keys = _get_bucket_keys(user_id)
+    try:
+        # One round-trip for all buckets
+        pipe = get_redis_connection("default").pipeline(transaction=False)
+        for key in keys:
+            pipe.hmget(cache.make_key(key), "tokens", "ts")
+        states = {
+            key: (float(tokens), float(ts))
+            for key, (tokens, ts) in zip(keys, pipe.execute())
+            if tokens is not None
+        }
+    except NotImplementedError:
+        states = cache.get_many(keys)
+
+    return [
+        int(_refill(states.get(key), capacity, capacity / period, now))
+        for key, (_, capacity, period) in zip(keys, _LIMITS)
+    ]
+
+
+# Sliding window
+
+# KEYS are (current, previous) window counters per limit; ARGV is
+# (limit, weight of the previous window, ttl) per limit. Increments every
+# current counter only if no limit would be exceeded.
+# Returns {0, 0, 0} on success, or {limit index, current, previous} on rejection.
+_HIT_LUA = """
+for i = 1, #KEYS / 2 do
+    local curr = tonumber(redis.call('GET', KEYS[2 * i - 1]) or 0)
+    local prev = tonumber(redis.call('GET', KEYS[2 * i]) or 0)
+    if curr + prev * tonumber(ARGV[3 * i - 1]) >= tonumber(ARGV[3 * i - 2]) then
+        return {i, curr, prev}
+    end
+end
+for i = 1, #KEYS / 2 do
+    redis.call('INCR', KEYS[2 * i - 1])
+    redis.call('EXPIRE', KEYS[2 * i - 1], ARGV[3 * i])
+end
+return {0, 0, 0}
+"""
+
+
+def _get_window_keys(user_id: int, now: float) -> list[tuple[str, str, float]]:
+    """(current key, previous key, weight of the previous window) for each limit."""
+    windows = []
+    for name, _, period in _LIMITS:
+        index = int(now // period)
+        windows.append(
+            (
+                _get_cache_key(user_id, f"window:{name}:{index}"),
+                _get_cache_key(user_id, f"window:{name}:{index - 1}"),
+                1 - (now % period) / period,
+            )
         )
+    return windows
+
 
-    # Check daily limit
-    daily_key = _get_daily_key(user_id)
-    daily_count = cache.get(daily_key, 0)
-
-    if daily_count >= LLM_RATE_LIMIT_REQUESTS_PER_DAY:
-        # Calculate seconds until midnight
-        now = datetime.now()
-        midnight = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
-        retry_after = int((midnight - now).total_seconds())
-        raise RateLimitExceeded(
-            f"Daily rate limit exceeded ({LLM_RATE_LIMIT_REQUESTS_PER_DAY} requests/day)",
-            retry_after=retry_after,
+def _window_counts(windows: list[tuple[str, str, float]]) -> dict:
+    """Current and previous counters of the given windows, from the cache."""
+    return cache.get_many([key for window in windows for key in window[:2]])
+
+
+def _window_retry_after(limit: int, period: int, curr: int, prev: int, weight: float) -> int:
+    """Seconds until the weighted count drops below limit, assuming no new requests."""
+    if curr >= limit or not prev:
+        # Wait for the current window to become the previous one, which then
+        # still counts in full, and for its weight to decay under the limit
+        decay = math.ceil((1 - limit / curr) * period) + 1 if curr else period
+        return math.ceil(weight * period) + decay
+    # Solve curr + prev * (weight - t / period) < limit for t
+    return max(1, math.ceil((weight - (limit - curr) / prev) * period) + 1)
+
+
+def _hit_windows(user_id: int, now: float) -> tuple[tuple[str, ...], int, int]:
+    """
+    Count a request in every current window, or none if any limit is reached.
+
+    Returns (keys to release, 1-based index of the exceeded limit or 0, retry_after).
+    """
+    windows = _get_window_keys(user_id, now)
+    current_keys = tuple(curr_key for curr_key, _, _ in windows)
+    try:
+        keys, args = [], []
+        for (curr_key, prev_key, weight), (_, limit, period) in zip(windows, _LIMITS):
+            keys += [curr_key, prev_key]
+            args += [limit, weight, 2 * period]
+        rejected, curr, prev = (int(v) for v in _run_script(_HIT_LUA, keys, args))
+    except NotImplementedError:
+        # Non-Redis cache backend (e.g. LocMemCache in tests): same logic, not atomic
+        counts = _window_counts(windows)
+        rejected = curr = prev = 0
+        for i, ((curr_key, prev_key, weight), (_, limit, _)) in enumerate(zip(windows, _LIMITS)):
+            c, p = counts.get(curr_key, 0), counts.get(prev_key, 0)
+            if c + p * weight >= limit:
+                rejected, curr, prev = i + 1, c, p
+                break
+        if not rejected:
+            for curr_key, (_, _, period) in zip(current_keys, _LIMITS):
+                cache.add(curr_key, 0, timeout=2 * period)
+                cache.incr(curr_key)
+
+    if not rejected:
+        return current_keys, 0, 0
+    _, limit, period = _LIMITS[rejected - 1]
+    weight = windows[rejected - 1][2]
+    return current_keys, rejected, _window_retry_after(limit, period, curr, prev, weight)
+
+
+def _unhit_windows(keys: tuple[str, ...]) -> None:
+    """Undo the counts added by _hit_windows()."""
+    for key in keys:
+        try:
+            cache.decr(key)
+        except ValueError:
+            # Counter already expired
+            pass
+
+
+def _remaining_in_windows(user_id: int, now: float) -> list[int]:
+    """Requests each sliding window would allow right now."""
+    windows = _get_window_keys(user_id, now)
+    counts = _window_counts(windows)
+    return [
+        max(0, limit - math.ceil(counts.get(curr_key, 0) + counts.get(prev_key, 0) * weight))
+        for (curr_key, prev_key, weight), (_, limit, _) in zip(windows, _LIMITS)
+    ]
+
+
+# Sliding log
+
+# KEYS[1] is the user's log; ARGV is (now, new member, then limit and period per
+# limit). Drops entries older than the longest period, then logs the request
+# only if every limit has room.
+# Returns {0, ""} on success, or {limit index, timestamp of the entry whose expiry
+# makes room again} on rejection.
+_LOG_LUA = """
+local now = tonumber(ARGV[1])
+local longest = 0
+for i = 1, (#ARGV - 2) / 2 do
+    longest = math.max(longest, tonumber(ARGV[2 * i + 2]))
+end
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now - longest)
+for i = 1, (#ARGV - 2) / 2 do
+    local limit = tonumber(ARGV[2 * i + 1])
+    local since = '(' .. (now - tonumber(ARGV[2 * i + 2]))
+    local count = redis.call('ZCOUNT', KEYS[1], since, '+inf')
+    if count >= limit then
+        local entry = redis.call(
+            'ZRANGEBYSCORE', KEYS[1], since, '+inf', 'WITHSCORES', 'LIMIT', count - limit, 1
         )
+        return {i, entry[2]}
+    end
+end
+redis.call('ZADD', KEYS[1], now, ARGV[2])
+redis.call('EXPIRE', KEYS[1], math.ceil(longest))
+return {0, ''}
+"""
+
+_LONGEST_PERIOD = max(period for _, _, period in _LIMITS)
+
+
+def _get_log_key(user_id: int) -> str:
+    """Get the cache key for the user's request log."""
+    return _get_cache_key(user_id, "log")
+
 
+def _append_log(user_id: int, now: float) -> tuple[tuple[str, ...], int, int]:
+    """
+    Log a request, or don't if any limit is reached.
 
-def increment_rate_limit(user_id: int) -> None:
+    Returns ((log key, entry) to release, 1-based index of the exceeded limit
+    or 0, retry_after).
     """
-    Increment the rate limit counters for a user.
+    key, member = _get_log_key(user_id), uuid.uuid4().hex
+    try:
+        args = [now, member]
+        for _, limit, period in _LIMITS:
+            args += [limit, period]
+        rejected, oldest = _run_script(_LOG_LUA, [key], args)
+        rejected, oldest = int(rejected), float(oldest or 0)
+    except NotImplementedError:
+        # Non-Redis cache backend (e.g. LocMemCache in tests): same logic, not atomic
+        log = [entry for entry in cache.get(key, []) if entry[0] > now - _LONGEST_PERIOD]
+        rejected = oldest = 0
+        for i, (_, limit, period) in enumerate(_LIMITS, start=1):
+            in_period = [ts for ts, _ in log if ts > now - period]
+            if len(in_period) >= limit:
+                rejected, oldest = i, in_period[len(in_period) - limit]
+                break
+        if not rejected:
+            cache.set(key, log + [(now, member)], timeout=_LONGEST_PERIOD)
 
-    Should be called after a successful LLM request.
+    if not rejected:
+        return (key, member), 0, 0
+    _, _, period = _LIMITS[rejected - 1]
+    return (key, member), rejected, max(1, math.ceil(oldest + period - now))
 
-    Args:
-        user_id: The ID of the user who made the request.
+
+def _remove_from_log(keys: tuple[str, ...]) -> None:
+    """Remove the entry added by _append_log()."""
+    key, member = keys
+    try:
+        get_redis_connection("default").zrem(cache.make_key(key), member)
+        return
+    except NotImplementedError:
+        pass
+
+    log = cache.get(key)
+    if log:
+        cache.set(key, [entry for entry in log if entry[1] != member], timeout=_LONGEST_PERIOD)
+
+
+def _remaining_in_log(user_id: int, now: float) -> list[int]:
+    """Requests each limit would allow right now, from the user's log."""
+    key = _get_log_key(user_id)
+    try:
+        pipe = get_redis_connection("default").pipeline(transaction=False)
+        for _, _, period in _LIMITS:
+            pipe.zcount(cache.make_key(key), f"({now - period}", "+inf")
+        counts = pipe.execute()
+    except NotImplementedError:
+        log = cache.get(key, [])
+        counts = [sum(ts > now - period for ts, _ in log) for _, _, period in _LIMITS]
+
+    return [max(0, limit - count) for count, (_, limit, _) in zip(counts, _LIMITS)]
+
+
+_ALGORITHMS = {
+    "token_bucket": (_take_tokens, _give_tokens, _remaining_tokens),
+    "sliding_window": (_hit_windows, _unhit_windows, _remaining_in_windows),
+    "sliding_log": (_append_log, _remove_from_log, _remaining_in_log),
+}
+try:
+    _reserve, _release, _remaining = _ALGORITHMS[LLM_RATE_LIMIT_ALGORITHM]
+except KeyError:
+    raise LLMConfigurationError(
+        f"Unknown LLM_RATE_LIMIT_ALGORITHM {LLM_RATE_LIMIT_ALGORITHM!r}, "
+        f"expected one of {', '.join(_ALGORITHMS)}"
+    ) from None
+
+
+def reserve_rate_limit(user_id: int) -> tuple[str, ...] | None:
+    """
+    Count a request against the user's limits, raising if either is exceeded.
+
+    Check and count happen together, so concurrent requests can't both slip
+    under the limit, and a rejection by one limit doesn't count against the
+    other. Pass the returned keys to release_rate_limit() if the request fails,
+    so only successful requests are counted.
+
+    Fails open: if Redis is unavailable the request is allowed and None is returned.
+
+    Raises:
+        RateLimitExceeded: If user has exceeded their rate limit.
     """
-    # Increment hourly counter (expires in 1 hour)
-    hourly_key = _get_hourly_key(user_id)
     try:
-        cache.incr(hourly_key)
-    except ValueError:
-        # Key doesn't exist, create it
-        cache.set(hourly_key, 1, timeout=3600)  # 1 hour
+        keys, rejected, retry_after = _reserve(user_id, time.time())
+    except RedisError as e:
+        logger.warning("LLM rate limiter unavailable, allowing request: %s", e)
+        return None
 
-    # Increment daily counter (expires in 24 hours)
-    daily_key = _get_daily_key(user_id)
+    if not rejected:
+        return keys
+
+    name, limit, _ = _LIMITS[rejected - 1]
+    raise RateLimitExceeded(
+        f"{'Hourly' if name == 'hour' else 'Daily'} rate limit exceeded "
+        f"({limit} requests/{name})",
+        retry_after=retry_after,
+    )
+
+
+def release_rate_limit(keys: tuple[str, ...]) -> None:
+    """Undo a reservation made by reserve_rate_limit()."""
     try:
-        cache.incr(daily_key)
-    except ValueError:
-        # Key doesn't exist, create it
-        cache.set(daily_key, 1, timeout=86400)  # 24 hours
+        _release(keys)
+    except RedisError as e:
+        logger.warning("Could not release LLM rate limit %s: %s", keys, e)
 
 
 def get_remaining_requests(user_id: int) -> dict:
@@ -104,21 +458,12 @@ def get_remaining_requests(user_id: int) -> dict:
     Returns:
         Dictionary with remaining hourly and daily requests.
     """
-    hourly_key = _get_hourly_key(user_id)
-    daily_key = _get_daily_key(user_id)
-
-    hourly_used = cache.get(hourly_key, 0)
-    daily_used = cache.get(daily_key, 0)
-
+    remaining = _remaining(user_id, time.time())
     return {
-        "hourly": {
-            "used": hourly_used,
-            "limit": LLM_RATE_LIMIT_REQUESTS_PER_HOUR,
-            "remaining": max(0, LLM_RATE_LIMIT_REQUESTS_PER_HOUR - hourly_used),
-        },
-        "daily": {
-            "used": daily_used,
-            "limit": LLM_RATE_LIMIT_REQUESTS_PER_DAY,
-            "remaining": max(0, LLM_RATE_LIMIT_REQUESTS_PER_DAY - daily_used),
-        },
+        "hourly" if name == "hour" else "daily": {
+            "used": limit - available,
+            "limit": limit,
+            "remaining": available,
+        }
+        for (name, limit, _), available in zip(_LIMITS, remaining)
     }
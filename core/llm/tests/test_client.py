@@ -0,0 +1,169 @@
+"""
+Tests for the async GeminiClient methods.
+
+The Gemini model is replaced by a fake, so no API key or network is needed.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from google.api_core import exceptions as google_exceptions
+from pydantic import BaseModel
+
+from core.llm import client as client_module
+from core.llm.client import GeminiClient
+from core.llm.exceptions import LLMConnectionError, LLMError, LLMResponseError, RateLimitExceeded
+
+
+class FakeModel:
+    """Stand-in for a Gemini model, recording how many calls overlap."""
+
+    def __init__(self, delays=None, error=None):
+        self.delays = delays or {}
+        self.error = error
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def generate_content_async(self, prompt, **kwargs):
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delays.get(prompt, 0.01))
+            if self.error:
+                raise self.error
+            return SimpleNamespace(text=f'{{"prompt": "{prompt}"}}', usage_metadata=None)
+        finally:
+            self.in_flight -= 1
+
+
+@pytest.fixture
+def reservations(monkeypatch):
+    """Record rate limit reservations and releases instead of touching the cache."""
+    calls = {"reserved": [], "released": []}
+
+    def reserve(user_id):
+        calls["reserved"].append(user_id)
+        return [f"key:{user_id}"]
+
+    monkeypatch.setattr(client_module, "reserve_rate_limit", reserve)
+    monkeypatch.setattr(client_module, "release_rate_limit", calls["released"].append)
+    return calls
+
+
+@pytest.fixture
+def make_client(monkeypatch, reservations):
+    """Return a function building a GeminiClient around a FakeModel."""
+    from django.core.cache import cache
+
+    cache.clear()
+    monkeypatch.setattr(client_module, "LLM_MAX_RETRIES", 0)
+
+    def make(model):
+        client = GeminiClient()
+        client._ensure_configured = lambda: None
+        client._get_model = lambda system_prompt: model
+        return client
+
+    return make
+
+
+class TestAgenerate:
+    """Tests for GeminiClient.agenerate."""
+
+    def test_returns_response_text(self, make_client, reservations):
+        """Test that the response text is returned and the request is counted."""
+        client = make_client(FakeModel())
+        assert asyncio.run(client.agenerate("a", user_id=1)) == '{"prompt": "a"}'
+        assert reservations == {"reserved": [1], "released": []}
+
+    @pytest.mark.parametrize(
+        "error, expected",
+        [
+            (google_exceptions.ResourceExhausted("quota"), RateLimitExceeded),
+            (google_exceptions.InvalidArgument("bad"), LLMError),
+            (google_exceptions.ServiceUnavailable("down"), LLMConnectionError),
+        ],
+    )
+    def test_translates_errors_and_releases(self, make_client, reservations, error, expected):
+        """Test that API errors are mapped onto LLM exceptions and don't count."""
+        client = make_client(FakeModel(error=error))
+        with pytest.raises(expected):
+            asyncio.run(client.agenerate("a", user_id=1))
+        assert reservations == {"reserved": [1], "released": [["key:1"]]}
+
+    def test_concurrency_is_capped(self, make_client, monkeypatch):
+        """Test that at most LLM_MAX_CONCURRENCY requests are in flight."""
+        monkeypatch.setattr(client_module, "LLM_MAX_CONCURRENCY", 2)
+        model = FakeModel()
+        client = make_client(model)
+
+        async def run():
+            await asyncio.gather(*(client.agenerate(str(i)) for i in range(5)))
+
+        asyncio.run(run())
+        assert (model.calls, model.max_in_flight) == (5, 2)
+
+    def test_semaphore_is_per_event_loop(self, make_client, monkeypatch):
+        """Test that a new event loop gets its own semaphore."""
+        monkeypatch.setattr(client_module, "LLM_MAX_CONCURRENCY", 1)
+        model = FakeModel()
+        client = make_client(model)
+
+        async def run():
+            await asyncio.gather(client.agenerate("a"), client.agenerate("b"))
+            return client._semaphore
+
+        first = asyncio.run(run())
+        second = asyncio.run(run())
+        assert first is not second
+        assert (model.calls, model.max_in_flight) == (4, 1)
+
+
+class ResponseModel(FakeModel):
+    """FakeModel returning a fixed response text."""
+
+    def __init__(self, text):
+        super().__init__()
+        self.text = text
+
+    async def generate_content_async(self, prompt, **kwargs):
+        self.calls += 1
+        return SimpleNamespace(text=self.text, usage_metadata=None)
+
+
+class Answer(BaseModel):
+    """Schema the cached responses are validated against."""
+
+    answer: int
+
+
+class TestAgenerateJsonCache:
+    """Tests for the response cache in GeminiClient.agenerate_json."""
+
+    def test_valid_response_is_cached(self, make_client):
+        """Test that a second identical request is served from the cache."""
+        model = ResponseModel('{"answer": 42}')
+        client = make_client(model)
+        for _ in range(2):
+            assert asyncio.run(client.agenerate_json("q", schema=Answer)) == Answer(answer=42)
+        assert model.calls == 1
+
+    def test_invalid_response_is_not_cached(self, make_client):
+        """Test that output failing the schema isn't served from the cache later."""
+        model = ResponseModel('{"answer": "many"}')
+        client = make_client(model)
+        for _ in range(2):
+            with pytest.raises(LLMResponseError, match="does not match Answer"):
+                asyncio.run(client.agenerate_json("q", schema=Answer))
+        assert model.calls == 2
+
+    def test_repaired_response_is_not_cached(self, make_client):
+        """Test that truncated output patched up by _repair_json isn't cached."""
+        model = ResponseModel('{"answer": 42, "steps": [1, 2')
+        client = make_client(model)
+        for _ in range(2):
+            assert asyncio.run(client.agenerate_json("q"))["answer"] == 42
+        assert model.calls == 2
@@ -0,0 +1,42 @@
+"""
+Tests for the LLM prompt helpers.
+"""
+
+from core.llm.prompts import format_goal_plan_prompt
+
+
+def _plan_prompt(title, description="", **kwargs):
+    return format_goal_plan_prompt(
+        goal_title=title,
+        goal_description=description,
+        answers_text="Q: Why?\nA: Because.",
+        target_date="2027-04-01",
+        today_date="2026-10-16",
+        **kwargs,
+    )
+
+
+class TestGoalPlanPrompt:
+    """Tests for format_goal_plan_prompt."""
+
+    def test_plan_size_is_inline(self):
+        """Test that the milestone and task counts are written into the instructions."""
+        prompt = _plan_prompt("Run a marathon", num_milestones=6, tasks_per_milestone=4)
+        assert "EXACTLY 6 MILESTONES with EXACTLY 4 TASKS EACH" in prompt
+        assert "exactly 4 tasks that are" in prompt
+
+
+class TestGoalPlanExample:
+    """Tests for the few-shot example in the plan prompt."""
+
+    def test_matching_goal_gets_example(self):
+        """Test that a language goal includes the language example."""
+        assert "## Example: Learning German" in _plan_prompt("Learn Spanish")
+
+    def test_keyword_in_description_counts(self):
+        """Test that the description is searched for keywords as well."""
+        assert "## Example:" in _plan_prompt("Trip to Madrid", "Reach B1 before we go")
+
+    def test_other_goal_gets_no_example(self):
+        """Test that a goal matching no keywords is sent without an example."""
+        assert "## Example:" not in _plan_prompt("Run a marathon")
@@ -0,0 +1,217 @@
+"""
+Tests for the LLM rate limiter.
+
+Each algorithm runs against Redis (fakeredis, which executes the Lua scripts)
+and against LocMemCache (the non-Redis fallback).
+"""
+
+import fakeredis
+import pytest
+from redis.exceptions import RedisError
+
+from core.llm import rate_limiter
+from core.llm.exceptions import RateLimitExceeded
+
+NOW = 1_700_000_000.0  # a fixed point in time, 1_700_000_000 % 3600 == 800
+
+REDIS_CACHES = {
+    "default": {
+        "BACKEND": "django_redis.cache.RedisCache",
+        "LOCATION": "redis://localhost:6379/0",
+        "OPTIONS": {"CONNECTION_POOL_KWARGS": {"connection_class": fakeredis.FakeRedisConnection}},
+    }
+}
+LOCMEM_CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+@pytest.fixture(params=["redis", "locmem"])
+def backend(request, settings):
+    """Run the test against a Redis-backed and a LocMemCache-backed cache."""
+    from django.core.cache import cache
+
+    settings.CACHES = REDIS_CACHES if request.param == "redis" else LOCMEM_CACHES
+    cache.clear()
+    yield request.param
+    cache.clear()
+
+
+@pytest.fixture
+def limits(monkeypatch):
+    """Return a function that sets the hourly and daily limits."""
+
+    def set_limits(hour, day):
+        monkeypatch.setattr(rate_limiter, "_LIMITS", (("hour", hour, 3600), ("day", day, 86400)))
+
+    set_limits(3, 10)
+    return set_limits
+
+
+@pytest.fixture(params=["token_bucket", "sliding_window", "sliding_log"])
+def algorithm(request, monkeypatch, backend, limits):
+    """Make reserve/release/remaining use each algorithm in turn."""
+    reserve, release, remaining = rate_limiter._ALGORITHMS[request.param]
+    monkeypatch.setattr(rate_limiter, "_reserve", reserve)
+    monkeypatch.setattr(rate_limiter, "_release", release)
+    monkeypatch.setattr(rate_limiter, "_remaining", remaining)
+    monkeypatch.setattr(rate_limiter.time, "time", lambda: NOW)
+    return request.param
+
+
+def _remaining(user_id=1):
+    remaining = rate_limiter.get_remaining_requests(user_id)
+    return remaining["hourly"]["remaining"], remaining["daily"]["remaining"]
+
+
+class TestReserveRateLimit:
+    """Behaviour shared by every algorithm, through the public API."""
+
+    def test_reserve_counts_against_both_limits(self, algorithm):
+        """Test that each reservation uses up one request of each limit."""
+        rate_limiter.reserve_rate_limit(1)
+        rate_limiter.reserve_rate_limit(1)
+        assert _remaining() == (1, 8)
+        assert _remaining(user_id=2) == (3, 10)
+
+    def test_hourly_limit_rejects(self, algorithm):
+        """Test that the request over the hourly limit raises with a retry_after."""
+        for _ in range(3):
+            rate_limiter.reserve_rate_limit(1)
+        with pytest.raises(RateLimitExceeded, match="Hourly") as exc:
+            rate_limiter.reserve_rate_limit(1)
+        assert exc.value.retry_after > 0
+        assert _remaining() == (0, 7)
+
+    def test_daily_rejection_leaves_hourly_untouched(self, algorithm, limits):
+        """Test that a request rejected by the daily limit isn't counted hourly."""
+        limits(hour=5, day=2)
+        rate_limiter.reserve_rate_limit(1)
+        rate_limiter.reserve_rate_limit(1)
+        with pytest.raises(RateLimitExceeded, match="Daily"):
+            rate_limiter.reserve_rate_limit(1)
+        assert _remaining() == (3, 0)
+
+    def test_release_gives_the_request_back(self, algorithm):
+        """Test that releasing a reservation restores both limits."""
+        rate_limiter.reserve_rate_limit(1)
+        keys = rate_limiter.reserve_rate_limit(1)
+        rate_limiter.release_rate_limit(keys)
+        assert _remaining() == (2, 9)
+
+    def test_fails_open_when_redis_is_down(self, algorithm, monkeypatch):
+        """Test that a Redis error allows the request."""
+
+        def unavailable(user_id, now):
+            raise RedisError("connection refused")
+
+        monkeypatch.setattr(rate_limiter, "_reserve", unavailable)
+        assert rate_limiter.reserve_rate_limit(1) is None
+
+
+class TestTokenBucket:
+    """Tests for the token_bucket algorithm."""
+
+    def test_retry_after_is_time_to_refill_one_token(self, backend, limits):
+        """Test that an empty hourly bucket refills one token in period / limit."""
+        for _ in range(3):
+            _, rejected, _ = rate_limiter._take_tokens(1, NOW)
+            assert rejected == 0
+        _, rejected, retry_after = rate_limiter._take_tokens(1, NOW)
+        assert (rejected, retry_after) == (1, 1200)
+
+    def test_bucket_refills_over_time(self, backend, limits):
+        """Test that a token is available again once retry_after has passed."""
+        for _ in range(3):
+            rate_limiter._take_tokens(1, NOW)
+        _, rejected, _ = rate_limiter._take_tokens(1, NOW + 1200)
+        assert rejected == 0
+        assert rate_limiter._remaining_tokens(1, NOW + 1200) == [0, 6]
+
+
+class TestSlidingWindowRetryAfter:
+    """Tests for _window_retry_after."""
+
+    def test_current_window_full(self):
+        """Test waiting for the current window to roll over when it alone is full."""
+        # 900s left in the current window (weight 0.25 of a 3600s period), after
+        # which it counts in full as the previous window for one more second
+        assert rate_limiter._window_retry_after(10, 3600, 10, 4, 0.25) == 901
+
+    def test_no_previous_requests(self):
+        """Test that with an empty previous window only the rollover helps."""
+        assert rate_limiter._window_retry_after(10, 3600, 10, 0, 0.5) == 1801
+
+    def test_partial_weight(self):
+        """Test solving for when the previous window's share drops under the limit."""
+        # 2 + 10 * (0.9 - t / 3600) < 10  <=>  t > 360
+        assert rate_limiter._window_retry_after(10, 3600, 2, 10, 0.9) == 361
+
+    def test_over_the_limit_decays_longer(self):
+        """Test that a window over the limit needs more decay after the rollover."""
+        # After the rollover: 20 * (1 - t / 3600) < 10  <=>  t > 1800
+        assert rate_limiter._window_retry_after(10, 3600, 20, 0, 0.5) == 1800 + 1801
+
+
+class TestSlidingWindow:
+    """Tests for the sliding_window algorithm at window boundaries."""
+
+    def test_previous_window_still_counts_after_the_boundary(self, backend, limits):
+        """Test that requests late in one window count against the start of the next."""
+        next_window = NOW - 800 + 3600
+        for _ in range(3):
+            rate_limiter._hit_windows(1, next_window - 1)
+        # At the boundary the previous window still counts in full
+        _, rejected, retry_after = rate_limiter._hit_windows(1, next_window)
+        assert (rejected, retry_after) == (1, 1)
+        _, rejected, _ = rate_limiter._hit_windows(1, next_window + 1)
+        assert rejected == 0
+
+    def test_retry_after_is_enough(self, backend, limits):
+        """Test that a request retried after retry_after is accepted."""
+        for _ in range(3):
+            rate_limiter._hit_windows(1, NOW)
+        _, rejected, retry_after = rate_limiter._hit_windows(1, NOW)
+        assert (rejected, retry_after) == (1, 2801)
+        _, rejected, _ = rate_limiter._hit_windows(1, NOW + retry_after)
+        assert rejected == 0
+
+
+class TestSlidingLog:
+    """Tests for the sliding_log algorithm."""
+
+    def test_retry_after_waits_for_the_oldest_entry(self, backend, limits):
+        """Test that retry_after is when the oldest logged request leaves the hour."""
+        for offset in (0, 10, 20):
+            rate_limiter._append_log(1, NOW + offset)
+        _, rejected, retry_after = rate_limiter._append_log(1, NOW + 30)
+        assert (rejected, retry_after) == (1, 3570)
+        _, rejected, _ = rate_limiter._append_log(1, NOW + 3601)
+        assert rejected == 0
+
+    def test_blocking_entry_offset_when_over_the_limit(self, backend, limits):
+        """Test that with more entries than the limit, the (count - limit)th one blocks."""
+        limits(hour=5, day=10)
+        for offset in (0, 10, 20, 30, 40):
+            rate_limiter._append_log(1, NOW + offset)
+        limits(hour=3, day=10)
+        # Down to 2 requests in the hour only once the entry at +20 expires
+        _, rejected, retry_after = rate_limiter._append_log(1, NOW + 50)
+        assert (rejected, retry_after) == (1, 3570)
+
+    def test_rejection_is_not_logged(self, backend, limits):
+        """Test that a rejected request doesn't add an entry."""
+        for _ in range(4):
+            rate_limiter._append_log(1, NOW)
+        assert rate_limiter._remaining_in_log(1, NOW) == [0, 7]
+
+    def test_release_removes_only_its_entry(self, backend, limits):
+        """Test that releasing drops the reserved entry (ZREM on Redis) and no other."""
+        rate_limiter._append_log(1, NOW)
+        keys, _, _ = rate_limiter._append_log(1, NOW)
+        rate_limiter._remove_from_log(keys)
+        assert rate_limiter._remaining_in_log(1, NOW) == [2, 9]
+        if backend == "redis":
+            from django_redis import get_redis_connection
+            from django.core.cache import cache
+
+            connection = get_redis_connection("default")
+            assert connection.zcard(cache.make_key(keys[0])) == 1